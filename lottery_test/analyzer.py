@@ -32,9 +32,36 @@
 - 蓝球：从 1-16 中选 1 个
 """
 
+import heapq
 import random
+import time
+from bisect import bisect
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Optional
+from itertools import accumulate, chain
+from operator import itemgetter
+from typing import List, Dict, Optional, Union, Iterable
+
+from data_fetcher import LotteryHistory
+
+
+# 预测结果时间戳缓存：同一秒内生成的预测共用一个格式化好的字符串
+_cached_second = None
+_cached_timestamp = ""
+
+
+def _now_timestamp() -> str:
+    """
+    获取当前时间的 ISO 格式字符串（精确到秒）
+
+    每秒最多格式化一次，批量生成预测时不必每次都调用 datetime.now().isoformat()
+    """
+    global _cached_second, _cached_timestamp
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_second = second
+        _cached_timestamp = datetime.fromtimestamp(second).isoformat()
+    return _cached_timestamp
 
 
 # =============================================================================
@@ -54,7 +81,7 @@ class FrequencyAnalyzer:
         analyzer.print_report()                       # 打印分析报告
     """
 
-    def __init__(self, data: List[Dict] = None):
+    def __init__(self, data: Optional[Union[List[Dict], LotteryHistory]] = None):
         """
         初始化频次分析器
 
@@ -64,10 +91,14 @@ class FrequencyAnalyzer:
                 - red_balls: 红球列表（6个数字）
                 - blue_ball: 蓝球数字
                 - date: 开奖日期
+                也可以直接传入按列存储的 LotteryHistory（分析时无需再打包）
         """
         # data 参数可以有默认值 None，这样创建对象时可以不带参数
         self.data = data if data is not None else []
 
+        # 初始化缓存（紧凑球号数据、频次结果）
+        self._reset_cache()
+
     def load_from_fetcher(self, fetcher):
         """
         从 DataFetcher 加载数据
@@ -75,50 +106,208 @@ class FrequencyAnalyzer:
         这是另一种获取数据的方式，传入一个 DataFetcher 对象
 
         Args:
-            fetcher: DataFetcher 对象，它有 load() 方法可以返回数据
+            fetcher: DataFetcher 对象，它有 load_history() 方法可以返回数据
+        """
+        # 按列存储：每期只占 7 个字节（6 个红球 + 1 个蓝球），
+        # 不再为每期组装一个字典和 7 个 int 对象
+        self.data = fetcher.load_history()
+
+        # 数据换了，旧的缓存作废
+        self._reset_cache()
+
+    @classmethod
+    def from_arrays(cls, reds: bytes, blues: bytes, **kwargs):
+        """
+        直接用打包好的球号数据创建分析器
+
+        配合 DataFetcher.load_arrays() 使用，省去"组装字典 -> 再打包"的过程
+
+        使用示例：
+            reds, blues, issues, dates = fetcher.load_arrays()
+            analyzer = FrequencyAnalyzer.from_arrays(reds, blues)
+
+        Args:
+            reds: 打包后的红球（每期 6 个字节）
+            blues: 打包后的蓝球（每期 1 个字节）
+            **kwargs: 传给构造函数的其他参数（例如加权分析器的 recent_weight）
+        """
+        return cls(LotteryHistory(reds, blues), **kwargs)
+
+    def _reset_cache(self):
+        """清空所有缓存（数据变化后调用）"""
+        # 紧凑存储的球号数据（由 _ensure_arrays 按需构建）
+        self._red_arr = None
+        self._blue_arr = None
+        # analyze() 的结果
+        self._freq_cache = None
+        # 缓存对应的数据标识，见 _sync_cache
+        self._cache_key = None
+
+    def _sync_cache(self):
+        """
+        检查数据是否变化，变了就清空缓存
+
+        缓存键 = (数据列表的 id, 数据条数)
+        直接给 self.data 赋值新列表、或往列表里追加数据，键都会变化
+        """
+        key = (id(self.data), len(self.data))
+        if key != self._cache_key:
+            self._reset_cache()
+            self._cache_key = key
+
+    def _ensure_arrays(self):
+        """
+        构建紧凑存储的球号缓存（只构建一次）
+
+        把所有红球按期依次排进一个 bytes（每期 6 个字节），
+        蓝球排进另一个 bytes（每期 1 个字节）。
+        球号最大才 33，一个字节就能存下。
+
+        Returns:
+            (红球 bytes, 蓝球 bytes)
+            如果数据里有超出 0-255 的数字（无法用一个字节存放），返回 (None, None)
+        """
+        self._sync_cache()
+        if self._red_arr is None:
+            if isinstance(self.data, LotteryHistory):
+                # 已经是按列存储的数据，直接使用
+                self._red_arr = self.data.reds
+                self._blue_arr = self.data.blues
+            else:
+                try:
+                    # chain.from_iterable 把每期的 6 个红球首尾相连，一次性打包
+                    self._red_arr = bytes(chain.from_iterable(
+                        item['red_balls'] for item in self.data))
+                    self._blue_arr = bytes(item['blue_ball'] for item in self.data)
+                except ValueError:
+                    return None, None
+        return self._red_arr, self._blue_arr
+
+    @staticmethod
+    def _count_balls(reds: bytes, blues: bytes, start: int = 0):
+        """
+        计数核心：统计从第 start 期开始（含）所有红球、蓝球的出现次数
+
+        analyze() 用它统计全部数据，analyze_weighted() 用它只统计近期数据。
+        bytes.count(球号, 起点) 直接在原数据上从起点开始计数，不需要切片复制。
+
+        Args:
+            reds: 打包后的红球（每期 6 个字节）
+            blues: 打包后的蓝球（每期 1 个字节）
+            start: 从第几期开始统计（默认 0，即全部数据）
+
+        Returns:
+            (红球次数列表, 蓝球次数列表)，列表下标就是球号（下标 0 不用）
+        """
+        # 红球每期占 6 个字节，所以起点位置要乘以 6
+        red_start = start * 6
+
+        red_counts = [0] + [reds.count(ball, red_start) for ball in range(1, 34)]
+        blue_counts = [0] + [blues.count(ball, start) for ball in range(1, 17)]
+        return red_counts, blue_counts
+
+    def _count_from(self, start: int = 0):
         """
-        self.data = fetcher.load()
+        统计从第 start 期开始的频次
+
+        数据能打包时用 _count_balls；打包不了（有超出范围的数字）时，
+        改用 collections.Counter 统计，Counter 的计数循环同样在 C 层完成。
+
+        Returns:
+            (红球次数列表, 蓝球次数列表)，列表下标就是球号（下标 0 不用）
+        """
+        reds, blues = self._ensure_arrays()
+        if reds is not None:
+            return self._count_balls(reds, blues, start)
+
+        rows = self.data[start:]
+        red_counter = Counter(chain.from_iterable(item['red_balls'] for item in rows))
+        blue_counter = Counter(item['blue_ball'] for item in rows)
+        return ([0] + [red_counter[ball] for ball in range(1, 34)],
+                [0] + [blue_counter[ball] for ball in range(1, 17)])
 
     def analyze(self) -> Dict:
         """
         分析球号出现频次
 
         核心算法：
-        1. 创建两个字典，分别统计红球和蓝球的频次
-        2. 遍历所有历史数据
-        3. 统计每个红球和蓝球出现的次数
+        1. 把历史数据打包成紧凑的 bytes（见 _ensure_arrays）
+        2. 对每个球号调用 bytes.count()，统计出现次数（见 _count_balls）
+           （数据无法打包时改用 Counter 统计，见 _count_from）
+        3. 最后再组装成 {球号: 次数} 字典返回
+
+        bytes.count() 在 C 层扫描内存，比逐期逐球累加字典快得多。
+        结果会缓存起来，数据不变时重复调用直接返回上次的结果。
 
         Returns:
             Dict: 包含以下内容
                 - red: 红球频次字典 {球号: 出现次数}
                 - blue: 蓝球频次字典 {球号: 出现次数}
+                - red_counts / blue_counts: 同样的次数，按球号下标排列的列表（下标 0 不用）
                 - total_records: 数据总条数
         """
-        # 如果没有数据，返回空结果
+        # 数据没变过，直接返回缓存
+        self._sync_cache()
+        if self._freq_cache is not None:
+            return self._freq_cache
+
+        # 如果没有数据，返回全部为 0 次的结果（字段和有数据时一致）
         if not self.data:
-            return {'red': {}, 'blue': {}, 'total_records': 0}
+            return self._make_result([0] * 34, [0] * 17, 0)
+
+        # 统计频次，范围外的球号自然不会被统计
+        red_counts, blue_counts = self._count_from()
+
+        # 保存并返回统计结果
+        self._freq_cache = self._make_result(red_counts, blue_counts, len(self.data))
+        return self._freq_cache
+
+    def analyze_streaming(self, rows: Iterable[Dict]) -> Dict:
+        """
+        边读取边统计频次（不保存数据）
+
+        rows 可以是任意可迭代对象，比如 DataFetcher.iter_rows() 生成器。
+        每读到一期就用 Counter.update() 计数，读完即丢弃，
+        适合历史数据很多、不想一次性全部加载进内存的情况。
+
+        使用示例：
+            result = analyzer.analyze_streaming(fetcher.iter_rows())
+
+        Args:
+            rows: 逐期产出 {'red_balls', 'blue_ball', ...} 字典的可迭代对象
 
-        # 初始化频次字典
-        # range(1, 34) 生成 1 到 33 的数字
-        red_frequency = {i: 0 for i in range(1, 34)}
-        blue_frequency = {i: 0 for i in range(1, 17)}
+        Returns:
+            Dict: 格式和 analyze() 相同（不会写入 analyze() 的缓存）
+        """
+        red_counter = Counter()
+        blue_counter = Counter()
+        total = 0
+
+        for item in rows:
+            red_counter.update(item['red_balls'])
+            blue_counter[item['blue_ball']] += 1
+            total += 1
 
-        # 遍历每一条历史数据
-        for item in self.data:
-            # 遍历该期的 6 个红球
-            for ball in item['red_balls']:
-                # 如果球号在字典中，计数加 1
-                if ball in red_frequency:
-                    red_frequency[ball] += 1
+        if not total:
+            return self._make_result([0] * 34, [0] * 17, 0)
 
-            # 蓝球只有一个，直接计数
-            blue_frequency[item['blue_ball']] += 1
+        return self._make_result([0] + [red_counter[ball] for ball in range(1, 34)],
+                                 [0] + [blue_counter[ball] for ball in range(1, 17)],
+                                 total)
 
-        # 返回统计结果
+    @staticmethod
+    def _make_result(red_counts: List, blue_counts: List, total: int) -> Dict:
+        """把按球号下标排列的次数列表组装成 analyze() 的返回格式"""
         return {
-            'red': red_frequency,
-            'blue': blue_frequency,
-            'total_records': len(self.data)
+            # 组装成字典，range(1, 34) 生成 1 到 33 的数字
+            'red': dict(zip(range(1, 34), red_counts[1:])),
+            'blue': dict(zip(range(1, 17), blue_counts[1:])),
+            'red_counts': red_counts,
+            'blue_counts': blue_counts,
+            # 最大频次随结果一起缓存，预测时不必再扫描一遍
+            'red_max_count': max(red_counts),
+            'blue_max_count': max(blue_counts),
+            'total_records': total
         }
 
     def get_min_frequency(self) -> Dict:
@@ -179,15 +368,16 @@ class FrequencyAnalyzer:
         print()
 
         print("【红球频次分布（前10）】")
-        # sorted() 排序，key=lambda x: x[1] 表示按值排序
-        sorted_red = sorted(freq['red'].items(), key=lambda x: x[1])[:10]
+        # heapq.nsmallest() 只挑出最小的 10 个，不必把 33 个全部排序
+        # key=itemgetter(1) 表示按值（次数）比较，和 lambda x: x[1] 一样但更快
+        sorted_red = heapq.nsmallest(10, freq['red'].items(), key=itemgetter(1))
         for ball, count in sorted_red:
             # :2d 表示占2位宽度，不足补空格
             print(f"  球号 {ball:2d}: {count} 次")
         print()
 
         print("【蓝球频次分布】")
-        sorted_blue = sorted(freq['blue'].items(), key=lambda x: x[1])
+        sorted_blue = sorted(freq['blue'].items(), key=itemgetter(1))
         for ball, count in sorted_blue:
             print(f"  球号 {ball:2d}: {count} 次")
         print("=" * 50)
@@ -197,10 +387,13 @@ class FrequencyAnalyzer:
 # 第二部分：WeightedFrequencyAnalyzer - 加权频次分析器
 # =============================================================================
 
-class WeightedFrequencyAnalyzer:
+class WeightedFrequencyAnalyzer(FrequencyAnalyzer):
     """
     加权频次分析器 - 用于方法二
 
+    继承自 FrequencyAnalyzer，所以同一个对象既能做全局频次分析（analyze），
+    也能做加权分析（analyze_weighted），两者共用同一份缓存数据
+
     方法二逻辑：
     1. 先计算全部历史数据的频次（基础）
     2. 再用近160期数据加权（近期权重=3倍）
@@ -214,35 +407,55 @@ class WeightedFrequencyAnalyzer:
     - 方法二：全部历史 + 近160期加权
     """
 
-    def __init__(self, data: List[Dict] = None, recent_weight: float = 3.0,
-                 name: str = "加权分析器"):
+    def __init__(self, data: Optional[Union[List[Dict], LotteryHistory]] = None,
+                 recent_weight: float = 3.0, name: str = "加权分析器"):
         """
         初始化加权频次分析器
 
         Args:
-            data: 历史数据列表
+            data: 历史数据（字典列表或 LotteryHistory）
             recent_weight: 近期数据的权重倍数（默认3倍）
             name: 分析器名称
         """
-        self.data = data if data is not None else []
+        super().__init__(data)
         self.recent_weight = recent_weight
         self.name = name
         self.prediction_history = []
 
-    def get_recent_data(self, count: int) -> List[Dict]:
+    def get_recent_data(self, count: int) -> Union[List[Dict], LotteryHistory]:
         """
         获取最近的 N 条数据
 
         列表切片语法：[-count:] 表示取最后 count 条
+        切片结果按 count 缓存，数据不变时不必重新切片；
+        数据是普通列表时返回缓存的副本，调用方修改返回值不会影响缓存
+        （LotteryHistory 的切片按列存放在 bytes 里，不提供修改方法，直接返回）
 
         Args:
             count: 要获取的数据条数
 
         Returns:
-            最近 count 条数据的列表
+            最近 count 条数据
         """
-        # 如果要求的数据量大于实际数据量，返回全部数据
-        return self.data[-count:] if count <= len(self.data) else self.data
+        self._sync_cache()
+        if count not in self._recent_cache:
+            # 如果要求的数据量大于实际数据量，返回全部数据
+            self._recent_cache[count] = (self.data[-count:] if count <= len(self.data)
+                                         else self.data)
+        recent = self._recent_cache[count]
+        if isinstance(recent, list):
+            return list(recent)
+        return recent
+
+    def _reset_cache(self):
+        """清空所有缓存，包括加权分析结果"""
+        super()._reset_cache()
+        # analyze_weighted() 的结果 {(近期条数, 权重倍数): 结果}
+        self._weighted_cache = {}
+        # 预测用的权重 {(近期条数, 权重倍数, 红球最大值, 蓝球最大值): (红球权重, 蓝球累积权重)}
+        self._weights_cache = {}
+        # get_recent_data() 的切片结果 {条数: 数据}
+        self._recent_cache = {}
 
     def analyze_weighted(self, recent_count: int = 160) -> Dict:
         """
@@ -257,53 +470,72 @@ class WeightedFrequencyAnalyzer:
         - 最近 160 期中出现 10 次
         - 加权频次 = 100 × 1 + 10 × 3 = 130
 
+        实现上，全部数据的频次直接复用 analyze() 的缓存结果，
+        这里只需再扫描最近 N 期：
+        加权频次 = 全部频次 + 近期频次 × (权重 - 1) = 110 + 10 × 2 = 130
+
         Args:
             recent_count: 近期数据条数（默认 160 = 蓝球16种 × 10）
 
         Returns:
-            加权后的频次统计
+            加权后的频次统计（数据不变时直接返回缓存），包含：
+                - red / blue: 加权频次字典 {球号: 加权值}
+                - red_counts / blue_counts: 同样的加权值，按球号下标排列的列表（下标 0 不用）
+                - red_max_count / blue_max_count: 最大加权值
+                - total_records: 数据总条数
+                - recent_count: 实际使用的近期数据条数
         """
-        if not self.data:
-            return {'red': {}, 'blue': {}, 'total_records': 0, 'recent_count': 0}
-
-        # 初始化频次字典
-        red_frequency = {i: 0 for i in range(1, 34)}
-        blue_frequency = {i: 0 for i in range(1, 17)}
-
-        # 获取近期数据
-        recent_data = self.get_recent_data(recent_count)
-        recent_count = len(recent_data)  # 实际获取到的数量
-
-        # 计算早期数据范围
-        # data[:-recent_count] 表示排除最后 recent_count 条
-        early_data = self.data[:-recent_count] if recent_count > 0 else []
-
-        # 统计早期数据（权重 = 1）
-        for item in early_data:
-            for ball in item['red_balls']:
-                if ball in red_frequency:
-                    red_frequency[ball] += 1
-            blue_frequency[item['blue_ball']] += 1
-
-        # 统计近期数据（权重 = recent_weight）
-        for item in recent_data:
-            for ball in item['red_balls']:
-                if ball in red_frequency:
-                    # 每出现一次，计数增加权重值
-                    red_frequency[ball] += self.recent_weight
-            blue_frequency[item['blue_ball']] += self.recent_weight
+        # 同样的参数算过一次就直接返回
+        self._sync_cache()
+        cache_key = (recent_count, self.recent_weight)
+        if cache_key in self._weighted_cache:
+            return self._weighted_cache[cache_key]
 
-        return {
+        total = len(self.data)
+
+        if not total:
+            # 没有数据：全部为 0 次，字段和有数据时一致
+            result = self._make_result([0] * 34, [0] * 17, 0)
+            result['recent_count'] = 0
+            return result
+
+        # 实际能取到的近期数据条数（和 get_recent_data 一致：超出总数或为 0 时取全部）
+        if not 0 < recent_count <= total:
+            recent_count = total
+
+        # 全部数据的频次（analyze() 有缓存，不会重复统计）
+        freq = self.analyze()
+
+        # 只统计最后 recent_count 期
+        recent_red, recent_blue = self._count_from(total - recent_count)
+
+        # 近期数据已经在全部频次里算过 1 次，再补上 (权重 - 1) 次
+        extra = self.recent_weight - 1
+        red_counts = [full + recent * extra
+                      for full, recent in zip(freq['red_counts'], recent_red)]
+        blue_counts = [full + recent * extra
+                       for full, recent in zip(freq['blue_counts'], recent_blue)]
+
+        red_frequency = dict(zip(range(1, 34), red_counts[1:]))
+        blue_frequency = dict(zip(range(1, 17), blue_counts[1:]))
+
+        self._weighted_cache[cache_key] = {
             'red': red_frequency,
             'blue': blue_frequency,
-            'total_records': len(self.data),
+            'red_counts': red_counts,
+            'blue_counts': blue_counts,
+            'red_max_count': max(red_counts),
+            'blue_max_count': max(blue_counts),
+            'total_records': total,
             'recent_count': recent_count
         }
+        return self._weighted_cache[cache_key]
 
     def predict_by_weighted_frequency(self, red_count: int = 6,
                                        red_max: int = 33,
                                        blue_max: int = 16,
-                                       recent_count: int = 160) -> Dict:
+                                       recent_count: int = 160,
+                                       timestamp: Optional[str] = None) -> Dict:
         """
         基于加权频次生成预测
 
@@ -320,43 +552,39 @@ class WeightedFrequencyAnalyzer:
             red_max: 红球最大值（33）
             blue_max: 蓝球最大值（16）
             recent_count: 近期数据条数
+            timestamp: 预测时间（可选，不传则使用当前时间）
 
         Returns:
             预测结果字典
         """
-        if not self.data:
-            # 没有数据时使用随机预测
-            return self.predict(red_count, red_max, blue_max)
-
         # 步骤1：加权分析
         weighted_freq = self.analyze_weighted(recent_count)
 
-        # 步骤2：计算权重（频次越低，权重越高）
-        red_weights = {}
-        blue_weights = {}
+        if not weighted_freq['total_records']:
+            # 没有数据时使用随机预测
+            return self.predict(red_count, red_max, blue_max, timestamp=timestamp)
 
-        # 找出最大频次
-        max_red_freq = max(weighted_freq['red'].values()) if weighted_freq['red'] else 1
-        max_blue_freq = max(weighted_freq['blue'].values()) if weighted_freq['blue'] else 1
+        # 步骤2：计算权重（频次越低，权重越高）
+        # 频次不变时权重也不变，同样的参数只计算一次
+        weights_key = (recent_count, self.recent_weight, red_max, blue_max)
+        if weights_key not in self._weights_cache:
+            # 计算每个球的权重（列表下标 i 对应 i+1 号球）
+            # 和 LotteryPredictor 的全局预测共用同一个计算方法
+            red_weights, blue_weights = self._inverse_weights(weighted_freq, red_max, blue_max)
 
-        # 计算每个球的权重
-        # 例如：最大频次是 100，某球频次是 80，则权重 = 100 - 80 + 1 = 21
-        for ball in range(1, red_max + 1):
-            freq = weighted_freq['red'].get(ball, 0)
-            red_weights[ball] = max_red_freq - freq + 1
+            # 蓝球只选一个，直接存累积权重
+            self._weights_cache[weights_key] = (red_weights, list(accumulate(blue_weights)))
 
-        for ball in range(1, blue_max + 1):
-            freq = weighted_freq['blue'].get(ball, 0)
-            blue_weights[ball] = max_blue_freq - freq + 1
+        red_weights, blue_cum_weights = self._weights_cache[weights_key]
 
         # 步骤3：基于权重随机选择
-        red_balls = self._weighted_sample(red_weights, red_count, red_max)
-        blue_ball = self._weighted_sample_one(blue_weights, blue_max)
+        red_balls = self._sample_balls(red_weights, red_count)
+        blue_ball = self._sample_ball_cum(blue_cum_weights)
 
         prediction = {
             "red_balls": red_balls,
             "blue_ball": blue_ball,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or _now_timestamp(),
             "predictor": f"{self.name}-加权预测",
             "method": "weighted_frequency",
             "recent_count": recent_count
@@ -369,10 +597,12 @@ class WeightedFrequencyAnalyzer:
         """
         加权随机选择（不重复）
 
-        算法：轮盘赌选择法
-        1. 计算所有权重总和
-        2. 随机生成一个 0 到总和之间的数
-        3. 依次累加权重，找到第一个超过随机数的选项
+        算法：随机键法
+        1. 每个球号生成一个随机键 key = u ** (1 / 权重)，u 为 (0,1) 均匀随机数
+        2. 取键值最大的 count 个球号
+
+        结果和"抽一个、移除一个"的轮盘赌分布完全相同，
+        但只需遍历一遍球号：不用反复重算总权重，也不会抽到重复号码重抽。
 
         Args:
             weights: 权重字典 {球号: 权重}
@@ -382,41 +612,111 @@ class WeightedFrequencyAnalyzer:
         Returns:
             选中的球号列表（已排序）
         """
-        # 可选球号列表
-        available = list(range(1, max_val + 1))
-        selected = []
-
-        # 重复选择 count 次
-        for _ in range(count):
-            # 计算总权重
-            total_weight = sum(weights.get(i, 1) for i in available)
-            # 随机生成一个数
-            r = random.uniform(0, total_weight)
-
-            # 累加权重，找到目标
-            cumsum = 0
-            for i in available:
-                cumsum += weights.get(i, 1)
-                if cumsum >= r:
-                    # 选中了这个球
-                    selected.append(i)
-                    # 从可选列表中移除，避免重复
-                    available.remove(i)
-                    break
-
-        return sorted(selected)
+        # 转成按球号排列的权重列表，没有给出权重的球号按 1 计算
+        return self._sample_balls(
+            [weights.get(i, 1) for i in range(1, max_val + 1)], count)
 
     def _weighted_sample_one(self, weights: Dict, max_val: int) -> int:
         """加权随机选择一个"""
-        total_weight = sum(weights.get(i, 1) for i in range(1, max_val + 1))
-        r = random.uniform(0, total_weight)
+        return self._sample_ball([weights.get(i, 1) for i in range(1, max_val + 1)])
+
+    @staticmethod
+    def _inverse_weights(freq: Dict, red_max: int, blue_max: int):
+        """
+        由 analyze() / analyze_weighted() 的结果计算逆向权重：频次越低，权重越高
+
+        权重 = 最大频次 - 当前频次 + 1
+        直接使用按球号下标排列的次数列表，返回同样按位置排列的权重列表
+        （下标 i 对应 i+1 号球），不再逐个球号查字典；
+        超出统计范围的球号按 0 次计算
+
+        Returns:
+            (红球权重列表, 蓝球权重列表)
+        """
+        max_red_freq = freq['red_max_count']
+        max_blue_freq = freq['blue_max_count']
+
+        red_weights = [max_red_freq - c + 1 for c in freq['red_counts'][1:red_max + 1]]
+        blue_weights = [max_blue_freq - c + 1 for c in freq['blue_counts'][1:blue_max + 1]]
+        red_weights += [max_red_freq + 1] * (red_max - len(red_weights))
+        blue_weights += [max_blue_freq + 1] * (blue_max - len(blue_weights))
+
+        return red_weights, blue_weights
 
-        cumsum = 0
-        for i in range(1, max_val + 1):
-            cumsum += weights.get(i, 1)
-            if cumsum >= r:
-                return i
-        return 1
+    @staticmethod
+    def _sample_balls(ball_weights: List[float], count: int) -> List[int]:
+        """
+        按权重列表随机选择 count 个不重复的球号（算法见 _weighted_sample）
+
+        Args:
+            ball_weights: 权重列表，下标 i 对应 i+1 号球
+            count: 要选几个
+
+        Returns:
+            选中的球号列表（已排序）
+        """
+        # 最多只能选出 len(ball_weights) 个不同的球
+        count = min(count, len(ball_weights))
+        rand = random.random
+
+        # 权重为 0 的球键值恒为 0，只在不得不选时才会选中
+        keys = [rand() ** (1.0 / w) if w > 0 else 0.0 for w in ball_weights]
+        top = heapq.nlargest(count, range(len(ball_weights)), key=keys.__getitem__)
+
+        return sorted(i + 1 for i in top)
+
+    @staticmethod
+    def _sample_ball(ball_weights: List[float]) -> int:
+        """按权重列表随机选择一个球号（下标 i 对应 i+1 号球）"""
+        return WeightedFrequencyAnalyzer._sample_ball_cum(list(accumulate(ball_weights)))
+
+    @staticmethod
+    def _sample_ball_cum(cum_weights: List[float]) -> int:
+        """
+        按累积权重列表随机选择一个球号
+
+        在 [0, 总权重) 里取一个随机数，用二分查找定位它落在哪个球的区间里，
+        不用逐个累加权重
+
+        Args:
+            cum_weights: 累积权重，cum_weights[i] = 1..i+1 号球的权重之和
+
+        Returns:
+            选中的球号
+        """
+        return bisect(cum_weights, random.random() * cum_weights[-1]) + 1
+
+    @staticmethod
+    def _sample_balls_batch(ball_weights: List[float], count: int,
+                            k: int) -> List[List[int]]:
+        """
+        按权重列表一次生成 k 组、每组 count 个不重复的球号
+
+        算法（加权无放回抽样的"随机键"法）：
+        每个球生成一个随机键 key = u ** (1 / 权重)，u 为 (0,1) 均匀随机数，
+        取键值最大的 count 个球。结果与逐个轮盘抽样、抽中即移除的分布相同，
+        但不用反复重算总权重，也不会因为抽到重复号码而重抽。
+
+        Args:
+            ball_weights: 权重列表，下标 i 对应 i+1 号球
+            count: 每组选几个
+            k: 生成几组
+
+        Returns:
+            k 个球号列表（每个都已排序）
+        """
+        count = min(count, len(ball_weights))
+        # 权重的倒数只算一次；权重为 0 的球键值恒为 0，只在不得不选时才会选中
+        exponents = [(1.0 / w if w > 0 else None) for w in ball_weights]
+        indexes = range(len(ball_weights))
+        rand = random.random
+
+        rows = []
+        for _ in range(k):
+            keys = [rand() ** e if e is not None else 0.0 for e in exponents]
+            top = heapq.nlargest(count, indexes, key=keys.__getitem__)
+            rows.append(sorted(i + 1 for i in top))
+        return rows
 
     def print_weighted_report(self, recent_count: int = 160):
         """打印加权分析报告"""
@@ -431,21 +731,20 @@ class WeightedFrequencyAnalyzer:
         print()
 
         print("【红球加权频次（频次越低=权重越高）】")
-        sorted_red = sorted(weighted_freq['red'].items(),
-                           key=lambda x: x[1])[:10]
+        sorted_red = heapq.nsmallest(10, weighted_freq['red'].items(),
+                                     key=itemgetter(1))
         for ball, count in sorted_red:
             print(f"  球号 {ball:2d}: 加权值 {count:.1f}")
         print()
 
         print("【蓝球加权频次】")
-        sorted_blue = sorted(weighted_freq['blue'].items(),
-                            key=lambda x: x[1])
+        sorted_blue = sorted(weighted_freq['blue'].items(), key=itemgetter(1))
         for ball, count in sorted_blue:
             print(f"  球号 {ball:2d}: 加权值 {count:.1f}")
         print("=" * 50)
 
     def predict(self, red_count: int = 6, red_max: int = 33,
-                blue_max: int = 16) -> Dict:
+                blue_max: int = 16, timestamp: Optional[str] = None) -> Dict:
         """随机预测（备用方法）"""
         red_balls = sorted(random.sample(range(1, red_max + 1), red_count))
         blue_ball = random.randint(1, blue_max)
@@ -453,7 +752,7 @@ class WeightedFrequencyAnalyzer:
         return {
             "red_balls": red_balls,
             "blue_ball": blue_ball,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or _now_timestamp(),
             "predictor": self.name
         }
 
@@ -470,6 +769,8 @@ class LotteryPredictor:
     1. predict() - 全局随机预测
     2. predict_by_recent_data() - 近期加权预测
 
+    批量生成：predict_batch()
+
     常量：
     - RECENT_COUNT = 160（蓝球种类16 * 10）
     """
@@ -487,8 +788,33 @@ class LotteryPredictor:
         self.name = name
         self.prediction_history = []
 
-    def predict(self, data: List[Dict] = None, red_count: int = 6,
-                red_max: int = 33, blue_max: int = 16) -> Dict:
+        # 分析器缓存：{数据标识: 加权分析器}
+        # 同一份历史数据反复预测时复用同一个分析器，不必每次重新统计
+        self._cached = {}
+
+    def _get_analyzer(self, data) -> 'WeightedFrequencyAnalyzer':
+        """
+        获取 data 对应的分析器（有缓存就复用）
+
+        缓存键：(id(data), 数据条数, 最后一期期号)
+        数据对象换了、追加了新数据或最后一期变了，都会重新创建分析器。
+        只保留最近一份数据的分析器，避免缓存无限增长。
+
+        WeightedFrequencyAnalyzer 继承自 FrequencyAnalyzer，
+        全局分析和加权分析都可以用它。
+        """
+        key = (id(data), len(data), data[-1]['issue']) if data else None
+
+        analyzer = self._cached.get(key)
+        if analyzer is None:
+            analyzer = WeightedFrequencyAnalyzer(data, recent_weight=3.0)
+            self._cached = {key: analyzer}
+        return analyzer
+
+    def predict(self, data: Optional[Union[List[Dict], LotteryHistory]] = None,
+                red_count: int = 6, red_max: int = 33, blue_max: int = 16,
+                analyzer: Optional[FrequencyAnalyzer] = None,
+                timestamp: Optional[str] = None) -> Dict:
         """
         方式一：全局数据分析预测
 
@@ -500,10 +826,12 @@ class LotteryPredictor:
         - 基于逆向权重随机选择（频次越低越容易被选中）
 
         Args:
-            data: 历史数据列表（可选，如果不传则随机选择）
+            data: 历史数据（字典列表或 LotteryHistory，可选，如果不传则随机选择）
             red_count: 红球数量（6个）
             red_max: 红球最大值（33）
             blue_max: 蓝球最大值（16）
+            analyzer: 已有的频次分析器（可选，传入可复用它缓存的分析结果）
+            timestamp: 预测时间（可选，不传则使用当前时间）
 
         Returns:
             预测结果字典
@@ -513,26 +841,20 @@ class LotteryPredictor:
             red_balls = sorted(random.sample(range(1, red_max + 1), red_count))
             blue_ball = random.randint(1, blue_max)
         else:
-            # 创建频次分析器
-            analyzer = FrequencyAnalyzer(data)
-            freq = analyzer.analyze()
-
-            # 计算逆向权重：频次越低，权重越高
-            # 权重 = 最大频次 - 当前频次 + 1
-            max_red_freq = max(freq['red'].values())
-            max_blue_freq = max(freq['blue'].values())
-
-            red_weights = {i: max_red_freq - freq['red'].get(i, 0) + 1 for i in range(1, red_max + 1)}
-            blue_weights = {i: max_blue_freq - freq['blue'].get(i, 0) + 1 for i in range(1, blue_max + 1)}
+            # 没有传入分析器时，使用缓存的分析器
+            if analyzer is None:
+                analyzer = self._get_analyzer(data)
+            red_weights, blue_weights = self._inverse_weights(
+                analyzer.analyze(), red_max, blue_max)
 
             # 使用加权选择
-            red_balls = self._weighted_sample(red_weights, red_count, red_max)
-            blue_ball = self._weighted_sample_one(blue_weights, blue_max)
+            red_balls = WeightedFrequencyAnalyzer._sample_balls(red_weights, red_count)
+            blue_ball = WeightedFrequencyAnalyzer._sample_ball(blue_weights)
 
         prediction = {
             "red_balls": red_balls,
             "blue_ball": blue_ball,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or _now_timestamp(),
             "predictor": self.name,
             "method": "global_frequency"
         }
@@ -540,22 +862,26 @@ class LotteryPredictor:
         self.prediction_history.append(prediction)
         return prediction
 
-    def predict_by_recent_data(self, data: List[Dict],
+    def predict_by_recent_data(self, data: Union[List[Dict], LotteryHistory],
                                red_count: int = 6,
                                red_max: int = 33,
                                blue_max: int = 16,
-                               recent_count: int = None) -> Dict:
+                               recent_count: int = None,
+                               analyzer: Optional[WeightedFrequencyAnalyzer] = None,
+                               timestamp: Optional[str] = None) -> Dict:
         """
         方式二：近期加权数据分析预测
 
         特点：基于近期数据分析，频次越低的球回补概率越高
 
         Args:
-            data: 历史数据列表
+            data: 历史数据（字典列表或 LotteryHistory）
             red_count: 红球数量（6个）
             red_max: 红球最大值（33）
             blue_max: 蓝球最大值（16）
             recent_count: 近期数据条数（默认160期）
+            analyzer: 已有的加权分析器（可选，传入可复用它缓存的分析结果）
+            timestamp: 预测时间（可选，不传则使用当前时间）
 
         Returns:
             预测结果字典
@@ -563,20 +889,24 @@ class LotteryPredictor:
         if recent_count is None:
             recent_count = self.RECENT_COUNT
 
-        # 创建加权分析器并生成预测
-        analyzer = WeightedFrequencyAnalyzer(data, recent_weight=3.0)
+        # 没有传入分析器时，使用缓存的加权分析器
+        if analyzer is None:
+            analyzer = self._get_analyzer(data)
+
+        # 生成预测
         result = analyzer.predict_by_weighted_frequency(
             red_count=red_count,
             red_max=red_max,
             blue_max=blue_max,
-            recent_count=recent_count
+            recent_count=recent_count,
+            timestamp=timestamp
         )
         result["predictor"] = self.name
 
         self.prediction_history.append(result)
         return result
 
-    def predict_both_methods(self, data: List[Dict],
+    def predict_both_methods(self, data: Union[List[Dict], LotteryHistory],
                              red_count: int = 6,
                              red_max: int = 33,
                              blue_max: int = 16) -> Dict:
@@ -588,52 +918,91 @@ class LotteryPredictor:
         """
         recent_count = self.RECENT_COUNT
 
+        # 两种方式共用同一个分析器，历史数据只打包、统计一次；
+        # 同一份数据再次调用时，直接复用上次的分析器和统计结果
+        analyzer = self._get_analyzer(data)
+
+        # 两种结果使用同一个时间戳
+        timestamp = _now_timestamp()
+
         # 方式一：全局随机
-        method1 = self.predict(red_count, red_max, blue_max)
+        method1 = self.predict(data, red_count, red_max, blue_max,
+                               analyzer=analyzer, timestamp=timestamp)
         method1["method_name"] = "全局随机预测"
 
         # 方式二：近期加权
         method2 = self.predict_by_recent_data(
-            data, red_count, red_max, blue_max, recent_count
+            data, red_count, red_max, blue_max, recent_count,
+            analyzer=analyzer, timestamp=timestamp
         )
         method2["method_name"] = f"近期加权预测（近{recent_count}期）"
 
         return {
             "method1": method1,
             "method2": method2,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
 
-    def _weighted_sample(self, weights: Dict, count: int, max_val: int) -> List[int]:
-        """加权随机选择（不重复）"""
-        available = list(range(1, max_val + 1))
-        selected = []
+    def predict_batch(self, n: int,
+                      data: Optional[Union[List[Dict], LotteryHistory]] = None,
+                      red_count: int = 6, red_max: int = 33,
+                      blue_max: int = 16) -> List[Dict]:
+        """
+        批量生成 n 注全局数据分析预测（方式一）
 
-        for _ in range(count):
-            total_weight = sum(weights.get(i, 1) for i in available)
-            r = random.uniform(0, total_weight)
+        权重只计算一次，n 注红球由 _sample_balls_batch 一次生成，
+        蓝球用一次 random.choices(k=n) 生成；所有预测共用同一个时间戳
+
+        Args:
+            n: 要生成几注
+            data: 历史数据（字典列表或 LotteryHistory，可选，如果不传则随机选择）
+            red_count: 红球数量（6个）
+            red_max: 红球最大值（33）
+            blue_max: 蓝球最大值（16）
 
-            cumsum = 0
-            for i in available:
-                cumsum += weights.get(i, 1)
-                if cumsum >= r:
-                    selected.append(i)
-                    available.remove(i)
-                    break
+        Returns:
+            预测结果字典的列表
+        """
+        if data:
+            red_weights, blue_weights = self._inverse_weights(
+                self._get_analyzer(data).analyze(), red_max, blue_max)
+        else:
+            # 没有数据时等权重，相当于随机选择
+            red_weights = [1] * red_max
+            blue_weights = [1] * blue_max
+
+        red_rows = WeightedFrequencyAnalyzer._sample_balls_batch(red_weights, red_count, n)
+        blue_balls = random.choices(range(1, blue_max + 1), weights=blue_weights, k=n)
+        timestamp = _now_timestamp()
+
+        predictions = [
+            {
+                "red_balls": red_balls,
+                "blue_ball": blue_ball,
+                "timestamp": timestamp,
+                "predictor": self.name,
+                "method": "global_frequency"
+            }
+            for red_balls, blue_ball in zip(red_rows, blue_balls)
+        ]
+
+        self.prediction_history.extend(predictions)
+        return predictions
+
+    @staticmethod
+    def _inverse_weights(freq: Dict, red_max: int, blue_max: int):
+        """由频次结果计算逆向权重（见 WeightedFrequencyAnalyzer._inverse_weights）"""
+        return WeightedFrequencyAnalyzer._inverse_weights(freq, red_max, blue_max)
 
-        return sorted(selected)
+    def _weighted_sample(self, weights: Dict, count: int, max_val: int) -> List[int]:
+        """加权随机选择（不重复，随机键法，见 WeightedFrequencyAnalyzer._weighted_sample）"""
+        return WeightedFrequencyAnalyzer._sample_balls(
+            [weights.get(i, 1) for i in range(1, max_val + 1)], count)
 
     def _weighted_sample_one(self, weights: Dict, max_val: int) -> int:
         """加权随机选择一个"""
-        total_weight = sum(weights.get(i, 1) for i in range(1, max_val + 1))
-        r = random.uniform(0, total_weight)
-
-        cumsum = 0
-        for i in range(1, max_val + 1):
-            cumsum += weights.get(i, 1)
-            if cumsum >= r:
-                return i
-        return 1
+        return WeightedFrequencyAnalyzer._sample_ball(
+            [weights.get(i, 1) for i in range(1, max_val + 1)])
 
     def get_history(self) -> List[Dict]:
         """获取预测历史"""
@@ -646,8 +1015,8 @@ class LotteryPredictor:
 
 def run_analysis(data_fetcher, show_report: bool = True):
     """运行分析流程"""
-    # 加载数据
-    data = data_fetcher.load()
+    # 加载数据（按列存储，分析时无需再打包）
+    data = data_fetcher.load_history()
     print(f"已加载 {len(data)} 条历史数据")
 
     # 分析频次
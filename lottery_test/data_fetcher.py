@@ -3,14 +3,128 @@
 
 """数据获取层 - 从网站 API 获取彩票数据并保存"""
 
+import csv
 import random
 import urllib.request
 import json
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterator
 import os
 
 
+def _is_valid_draw(red_balls: List[int], blue_ball: int) -> bool:
+    """
+    检查一期开奖号码是否合法
+
+    红球必须是 6 个 1-33 的数字，蓝球必须是 1-16 的数字。
+    数据在入库时校验一次，分析时就不用再逐个球检查范围。
+    """
+    return (len(red_balls) == 6
+            and all(1 <= ball <= 33 for ball in red_balls)
+            and 1 <= blue_ball <= 16)
+
+
+def _parse_row(parts: List[str]) -> Optional[Tuple[str, List[int], int, str]]:
+    """
+    解析 CSV 中的一行（已经由 csv.reader 拆分成字段）
+
+    load_arrays() 和 iter_rows() 共用这一个解析方法，两者对同一行的处理结果保持一致。
+    期号、日期会去掉首尾空白。
+
+    Returns:
+        (期号, 红球列表, 蓝球, 开奖日期)；
+        字段不足或号码超出范围时返回 None（号码异常时打印提示）
+    """
+    if len(parts) < 9:
+        return None
+
+    red_balls = list(map(int, parts[1:7]))
+    blue_ball = int(parts[7])
+
+    # 跳过号码超出范围的记录
+    if not _is_valid_draw(red_balls, blue_ball):
+        print(f"跳过异常数据: 期号 {parts[0]}")
+        return None
+
+    return parts[0].strip(), red_balls, blue_ball, parts[8].strip()
+
+
+def _issue_code(issue: str):
+    """
+    期号转成整数（如 '2026001' -> 2026001），用于查重
+
+    整数比字符串占用内存少、哈希更快；不是纯数字的期号原样返回
+    """
+    return int(issue) if issue.isdigit() else issue
+
+
+class LotteryHistory:
+    """
+    按列存储的历史数据
+
+    load() 返回"一期一个字典"，每期要占用好几个 Python 对象；
+    这里改成按列存放：所有红球依次排进一个 bytes，所有蓝球排进另一个 bytes，
+    期号、开奖日期各自一个列表。统计频次只需要扫描 reds / blues 两列。
+
+    它也可以当作只读的字典列表使用（len()、下标、切片、for 循环），
+    取出的每一期仍是 {'issue', 'red_balls', 'blue_ball', 'date'} 字典。
+
+    属性：
+        reds: 红球（每期 6 个字节，按期依次排列）
+        blues: 蓝球（每期 1 个字节）
+        issues: 期号列表
+        dates: 开奖日期列表
+    """
+
+    def __init__(self, reds: bytes = b'', blues: bytes = b'',
+                 issues: Optional[List[str]] = None,
+                 dates: Optional[List[str]] = None):
+        self.reds = bytes(reds)
+        self.blues = bytes(blues)
+        # 没有提供期号/日期时，用空字符串占位，保证各列长度一致
+        self.issues = issues if issues is not None else [''] * len(self.blues)
+        self.dates = dates if dates is not None else [''] * len(self.blues)
+
+    @classmethod
+    def from_dicts(cls, data: List[Dict]) -> 'LotteryHistory':
+        """从字典列表（load() 的返回格式）转换"""
+        reds = bytearray()
+        for item in data:
+            reds.extend(item['red_balls'])
+        return cls(reds,
+                   bytes(item['blue_ball'] for item in data),
+                   [item['issue'] for item in data],
+                   [item['date'] for item in data])
+
+    def __len__(self) -> int:
+        return len(self.blues)
+
+    def __getitem__(self, index):
+        # range(len)[index] 帮我们处理负数下标、越界检查和切片范围
+        rows = range(len(self))[index]
+
+        if isinstance(rows, int):
+            # 单个下标：返回这一期的字典
+            return {
+                'issue': self.issues[rows],
+                'red_balls': list(self.reds[rows * 6:rows * 6 + 6]),
+                'blue_ball': self.blues[rows],
+                'date': self.dates[rows]
+            }
+
+        if rows.step == 1:
+            # 连续切片：各列直接切片
+            return LotteryHistory(self.reds[rows.start * 6:rows.stop * 6],
+                                  self.blues[rows.start:rows.stop],
+                                  self.issues[index], self.dates[index])
+
+        return LotteryHistory.from_dicts([self[i] for i in rows])
+
+    def as_dicts(self) -> List[Dict]:
+        """转换成字典列表（兼容旧代码）"""
+        return [self[i] for i in range(len(self))]
+
+
 class DataFetcher:
     """数据获取器 - 负责从网站获取数据并保存"""
 
@@ -106,10 +220,20 @@ class DataFetcher:
                 red_nums = item.get('frontWinningNum', '').split()
                 blue_num = item.get('backWinningNum', '')
 
+                # map(int, ...) 在 C 层完成转换；1~33 这样的小整数 CPython 本来就有缓存，
+                # 不会每个号码都新建一个 int 对象
+                red_balls = list(map(int, red_nums))
+                blue_ball = int(blue_num) if blue_num else 0
+
+                # 跳过号码不完整或超出范围的记录
+                if not _is_valid_draw(red_balls, blue_ball):
+                    print(f"跳过异常数据: 期号 {item.get('issue', '')}")
+                    continue
+
                 result.append({
                     'issue': item.get('issue', ''),
-                    'red_balls': [int(x) for x in red_nums],
-                    'blue_ball': int(blue_num) if blue_num else 0,
+                    'red_balls': red_balls,
+                    'blue_ball': blue_ball,
                     'date': item.get('openTime', '')
                 })
 
@@ -123,14 +247,15 @@ class DataFetcher:
         """更新数据到本地文件，返回新增条数"""
         self.init_data_file()
 
-        # 获取本地已有的所有期号
+        # 获取本地已有的所有期号（存成整数，见 _issue_code）
         local_issues = set()
         try:
             with open(self.csv_path, 'r', encoding='utf-8-sig') as f:
-                for line in f.readlines()[1:]:
-                    parts = line.strip().split(',')
-                    if parts[0]:
-                        local_issues.add(parts[0])
+                next(f, None)  # 跳过表头
+                for line in f:
+                    issue = line.split(',', 1)[0].strip()
+                    if issue:
+                        local_issues.add(_issue_code(issue))
         except FileNotFoundError:
             pass
 
@@ -143,7 +268,8 @@ class DataFetcher:
             return 0
 
         # 过滤：只保留本地没有的期号
-        new_data = [item for item in web_data if item['issue'] not in local_issues]
+        new_data = [item for item in web_data
+                    if _issue_code(item['issue']) not in local_issues]
 
         if new_data:
             print(f"发现 {len(new_data)} 条新数据")
@@ -179,24 +305,79 @@ class DataFetcher:
                 line = f"{item['issue']},{red},{item['blue_ball']},{item['date']}\n"
                 f.write(line)
 
-    def load(self) -> List[Dict]:
-        """从 CSV 加载数据"""
-        data = []
+    def load_arrays(self) -> Tuple[bytes, bytes, List[str], List[str]]:
+        """
+        从 CSV 加载数据，直接返回紧凑格式
+
+        红球、蓝球不再组装成一条条字典，而是依次打包进 bytes，
+        可以直接交给 FrequencyAnalyzer.from_arrays() 分析
+
+        Returns:
+            (红球 bytes（每期 6 个字节）, 蓝球 bytes（每期 1 个字节）, 期号列表, 开奖日期列表)
+        """
+        reds = bytearray()
+        blues = bytearray()
+        issues = []
+        dates = []
         try:
-            with open(self.csv_path, 'r', encoding='utf-8-sig') as f:
-                for line in f.readlines()[1:]:  # 跳过表头
-                    parts = line.strip().split(',')
-                    if len(parts) >= 9:
-                        data.append({
-                            'issue': parts[0],
-                            'red_balls': [int(parts[1]), int(parts[2]), int(parts[3]),
-                                         int(parts[4]), int(parts[5]), int(parts[6])],
-                            'blue_ball': int(parts[7]),
-                            'date': parts[8]
-                        })
+            with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # 跳过表头
+                for parts in reader:
+                    row = _parse_row(parts)
+                    if row is None:
+                        continue
+
+                    issue, red_balls, blue_ball, date = row
+                    issues.append(issue)
+                    reds.extend(red_balls)
+                    blues.append(blue_ball)
+                    dates.append(date)
+        except FileNotFoundError:
+            print(f"数据文件不存在: {self.csv_path}")
+        return bytes(reds), bytes(blues), issues, dates
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """
+        逐行读取 CSV，每次产出一期数据（生成器）
+
+        不会把整个文件或全部数据一次性放进内存，
+        可以直接交给 FrequencyAnalyzer.analyze_streaming() 边读边统计
+
+        Yields:
+            {'issue', 'red_balls', 'blue_ball', 'date'} 字典，格式和 load() 相同
+        """
+        try:
+            with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # 跳过表头
+                for parts in reader:
+                    row = _parse_row(parts)
+                    if row is None:
+                        continue
+
+                    issue, red_balls, blue_ball, date = row
+                    yield {
+                        'issue': issue,
+                        'red_balls': red_balls,
+                        'blue_ball': blue_ball,
+                        'date': date
+                    }
         except FileNotFoundError:
             print(f"数据文件不存在: {self.csv_path}")
-        return data
+
+    def load_history(self) -> LotteryHistory:
+        """从 CSV 加载数据，按列存储（见 LotteryHistory）"""
+        return LotteryHistory(*self.load_arrays())
+
+    def load(self) -> List[Dict]:
+        """
+        从 CSV 加载数据（一期一个字典）
+
+        每期都要创建字典和 7 个 int 对象，数据多时很占内存；
+        只做统计分析时请用 load_history()
+        """
+        return self.load_history().as_dicts()
 
     def get_local_latest_issue(self) -> Optional[str]:
         """获取本地最新期号"""
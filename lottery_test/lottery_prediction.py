@@ -36,6 +36,7 @@
 import sys
 import os
 from datetime import datetime
+from typing import Dict, Optional, TextIO
 
 # 确保导入路径正确
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -44,34 +45,50 @@ from data_fetcher import DataFetcher
 from analyzer import FrequencyAnalyzer, LotteryPredictor
 
 
-def save_prediction_to_file(results: Dict, filename: str = "prediction_result.txt"):
+def save_prediction_to_file(results: Dict, filename: str = "prediction_result.txt",
+                            fh: Optional[TextIO] = None):
     """
     保存预测结果到文件
 
     格式：红球：xxx；蓝球xxx
 
+    整条记录先在内存中拼成一个字符串，再一次性写入
+
     Args:
         results: 包含预测结果的字典
         filename: 保存的文件名
+        fh: 已打开的追加模式文件句柄（可选）
+            频繁保存时由调用方保持打开、程序结束时关闭，避免每次都重新打开文件；
+            为 None 时按 filename 打开文件，写完即关闭
     """
+    m1 = results['method1']
+    m2 = results['method2']
+    record = ''.join([
+        f"预测时间: {results['time']}\n",
+        "-" * 40 + "\n",
+        # 方式一
+        "方式一 - 全局数据分析预测:\n",
+        f"红球：{m1['red_balls']}；蓝球{m1['blue_ball']}\n",
+        # 方式二
+        "方式二 - 近期加权预测:\n",
+        f"红球：{m2['red_balls']}；蓝球{m2['blue_ball']}\n",
+        "=" * 40 + "\n\n",
+    ])
+
+    if fh is not None:
+        try:
+            fh.write(record)
+            return True
+        except Exception as e:
+            print(f"\n保存预测结果失败: {e}")
+            return False
+
     # 获取文件所在目录
     file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
 
     try:
         with open(file_path, 'a', encoding='utf-8') as f:
-            # 写入时间
-            f.write(f"预测时间: {results['time']}\n")
-            f.write("-" * 40 + "\n")
-
-            # 方式一
-            f.write("方式一 - 全局数据分析预测:\n")
-            f.write(f"红球：{results['method1']['red_balls']}；蓝球{results['method1']['blue_ball']}\n")
-
-            # 方式二
-            f.write("方式二 - 近期加权预测:\n")
-            f.write(f"红球：{results['method2']['red_balls']}；蓝球{results['method2']['blue_ball']}\n")
-
-            f.write("=" * 40 + "\n\n")
+            f.write(record)
 
         print(f"\n预测结果已保存到: {file_path}")
         return True
@@ -107,8 +124,8 @@ def main(fetch_all: bool = False):
         new_count = fetcher.update()
         print(f"新增 {new_count} 条数据")
 
-    # 加载数据
-    data = fetcher.load()
+    # 加载数据（按列存储，分析时无需再打包）
+    data = fetcher.load_history()
     print(f"已加载 {len(data)} 条历史数据")
 
     # ========== 第二步：分析频次 ==========
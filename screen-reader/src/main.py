@@ -11,12 +11,10 @@
 工作流程:
     1. 程序启动，初始化各个模块
     2. 让用户选择要监控的屏幕区域
-    3. 进入监控循环：
-       a. 截取指定区域的图片
-       b. 使用 OCR 识别图片中的文字
-       c. 检测是否有新内容
-       d. 如果有新内容，加入播报队列
-       e. 等待一段时间后重复
+    3. 进入监控流水线（三个环节同时进行）：
+       a. 截图线程：每隔一段时间截取指定区域的图片
+       b. 识别线程：使用 OCR 识别图片中的文字
+       c. 主线程：检测是否有新内容，如果有，加入播报队列
     4. 用户按 Ctrl+C 退出程序
 
 核心类:
@@ -26,6 +24,7 @@
     - selector: 区域选择模块
     - ocr: 文字识别模块
     - tts: 语音播报模块
+    - utils: 通用工具
 =================================================================
 """
 
@@ -44,6 +43,14 @@ import os
 # 用于实现延时等待
 import time
 
+# threading: 线程模块
+# 让截图、识别两个环节在后台同时运行
+import threading
+
+# queue: 线程安全的队列
+# 用来在截图线程、识别线程、主线程之间传递数据
+import queue
+
 # typing: 类型提示模块
 # 用于声明变量类型，让代码更清晰
 from typing import Optional, Tuple
@@ -88,6 +95,9 @@ from ocr import OCREngine
 # 语音播报模块：负责把文字转换成语音播放
 from tts import TTSPlayer
 
+# 通用工具：队列满了丢掉最旧元素的 put_latest
+from utils import put_latest
+
 
 class ScreenReader:
     """
@@ -105,6 +115,18 @@ class ScreenReader:
         初始化 -> 选择区域 -> 开始监控 -> (截取 -> 识别 -> 播报) 循环 -> 退出
     """
 
+    # 合并播报的时间窗口（秒）
+    # 这段时间内陆续出现的新内容先攒起来，合并成一句交给语音播报器
+    SPEAK_BATCH_WINDOW = 0.25
+
+    # 攒够这么多字就立即播报，不再等时间窗口结束
+    SPEAK_BATCH_CHARS = 80
+
+    # last_text 最多保留结尾这么多个字符
+    # 比较新旧文本只需要旧文本的结尾来对齐（见 OCREngine.get_text_diff），
+    # 不必保留整段越来越长的历史，每次比较的开销也就有了上限
+    LAST_TEXT_MAX_CHARS = 4096
+
     def __init__(self, check_interval: float = 0.5, tesseract_path: Optional[str] = None):
         """
         初始化屏幕阅读器
@@ -147,15 +169,24 @@ class ScreenReader:
         # None 表示还没有选择区域
         self.region: Optional[Tuple[int, int, int, int]] = None
 
-        # 上一次识别到的完整文本
+        # 上一次识别到的文本（最多保留结尾 LAST_TEXT_MAX_CHARS 个字符）
         # 用于检测是否有新内容
         # 初始化为空字符串
         self.last_text = ""
 
+        # 上一次识别文本的哈希值
+        # 先比较哈希值判断内容有没有变化，没变就不必比较、切片整段文字
+        self.last_text_hash = hash("")
+
         # 程序运行状态
         # True = 正在运行，False = 已停止
         self.is_running = False
 
+        # 等待合并播报的新内容（见 _queue_speech）
+        self._pending = []
+        # 第一段待播报内容加入的时间
+        self._pending_since = 0.0
+
     def select_region(self) -> bool:
         """
         让用户选择要监控的屏幕区域
@@ -195,20 +226,27 @@ class ScreenReader:
 
     def run(self) -> None:
         """
-        运行监控循环
+        运行监控流水线
 
         这是程序的核心方法，负责持续监控屏幕
 
         工作流程:
             1. 确保已选择区域（如果没有，调用 select_region）
             2. 打印开始信息
-            3. 进入循环：
-               a. 截取指定区域的图片
-               b. 使用 OCR 识别文字
-               c. 检测是否有新内容
-               d. 如果有新内容，加入播报队列
-               e. 等待一段时间
+            3. 启动两个后台线程，和主线程组成三段流水线：
+               a. 截图线程（_capture_loop）：每隔 check_interval 秒截一次图
+               b. 识别线程（_ocr_loop）：对截图进行 OCR 识别
+               c. 主线程：检测新内容，加入播报队列（_handle_text）
             4. 响应 Ctrl+C 中断
+
+        为什么用流水线？
+            原来的写法是"截图 -> 识别 -> 播报 -> 等待"依次进行，
+            OCR 的耗时会叠加在等待时间上
+            拆成流水线后，识别上一张图的同时，下一张图已经在截取了
+
+        队列说明:
+            截图队列、结果队列最多各放 2 个元素
+            识别跟不上时丢掉最旧的截图，只处理最新的画面，内存也不会无限增长
         """
         # 检查是否已选择区域
         if self.region is None:
@@ -231,95 +269,40 @@ class ScreenReader:
         # 设置运行状态为 True
         self.is_running = True
 
+        # 截图队列：截图线程 -> 识别线程
+        capture_queue = queue.Queue(maxsize=2)
+        # 结果队列：识别线程 -> 主线程
+        text_queue = queue.Queue(maxsize=2)
+
+        # 创建后台线程
+        # daemon=True 表示主程序退出时，这些线程会自动结束
+        workers = [
+            threading.Thread(target=self._capture_loop, args=(capture_queue,), daemon=True),
+            threading.Thread(target=self._ocr_loop, args=(capture_queue, text_queue), daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
         try:
             # ======================
-            # 主监控循环
+            # 主线程：处理识别结果
             # ======================
 
             # 只要 is_running 是 True，就继续循环
             while self.is_running:
+                try:
+                    # 等待识别结果
+                    # timeout 让循环定期醒来：检查 is_running 以便及时退出，
+                    # 并把攒了一段时间的新内容提交播报
+                    text = text_queue.get(timeout=self.SPEAK_BATCH_WINDOW)
+                except queue.Empty:
+                    text = None
 
-                # ----------------------
-                # 第一步：截取并识别文字
-                # ----------------------
-
-                # 调用 OCR 引擎，从指定区域提取文字
-                # self.region 是用户选择的区域坐标
-                # 返回值是识别出的文字（字符串）
-                text = self.ocr.extract_from_region(self.region)
-
-                # ----------------------
-                # 第二步：处理识别结果
-                # ----------------------
-
-                # 检查是否识别到文字
-                if text:
-                    # 规范化文本
-                    # 1. 移除所有空格（OCR 可能会在字之间加空格）
-                    # 2. 移除首尾空白
-                    text = text.replace(' ', '').strip()
-
-                    # 打印日志：显示识别到了多少字符
-                    print(f"[监控] 识别到 {len(text)} 字符")
-
-                    # ----------------------
-                    # 第三步：检测新内容
-                    # ----------------------
-
-                    # 检查文字是否有变化
-                    if text and text != self.last_text:
-                        # 文字变了！
-
-                        # 判断是首次识别还是增量更新
-                        if not self.last_text:
-                            # 第一次识别，没有任何历史内容
-                            # 播报全部内容
-                            new_content = text
-
-                            # 打印日志
-                            print(f"[首次] 播报全部内容")
-
-                        else:
-                            # 不是第一次，有历史内容
-                            # 计算新增的部分
-                            # new_text = "旧内容" + "新内容"
-                            # 所以新内容 = 完整内容 - 旧内容
-                            new_content = text[len(self.last_text):].strip()
-
-                            # 打印日志：显示新增内容的长度
-                            print(f"[增量] 新增内容长度: {len(new_content)}")
-
-                        # ----------------------
-                        # 第四步：触发语音播报
-                        # ----------------------
-
-                        # 检查新增内容是否有效
-                        # 至少要有 2 个字符才播报，避免噪音
-                        if new_content and len(new_content) >= 2:
-                            # 打印新内容（只显示前 30 个字符）
-                            print(f"[新内容] {new_content[:30]}...")
-
-                            # 调用语音播报器，把新内容加入队列
-                            self.tts.speak(new_content)
-                        else:
-                            # 内容太短，可能是误识别
-                            print(f"[跳过] 内容太短或为空")
-
-                        # 更新历史记录
-                        # 保存当前的完整内容，作为下一次比较的基础
-                        self.last_text = text
-
-                    else:
-                        # 文字没有变化
-                        print(f"[相同] 内容无变化")
-
-                # ----------------------
-                # 第五步：等待下一次检查
-                # ----------------------
-
-                # 等待一段时间再检查
-                # 这样可以避免 CPU 占用过高
-                time.sleep(self.check_interval)
+                if text is not None:
+                    self._handle_text(text)
+
+                # 攒够时间的内容提交播报
+                self._flush_speech()
 
         except KeyboardInterrupt:
             # 用户按了 Ctrl+C，触发这个异常
@@ -334,6 +317,158 @@ class ScreenReader:
             # 确保程序正确停止
             self.stop()
 
+            # 等待后台线程结束（最多等 2 秒，正在识别的图片可能要多花点时间）
+            for worker in workers:
+                worker.join(timeout=2)
+
+    def _capture_loop(self, capture_queue: queue.Queue) -> None:
+        """
+        截图线程：每隔 check_interval 秒截取一次区域图片，放进截图队列
+        """
+        try:
+            while self.is_running:
+                image = self.ocr.capture_region(self.region)
+                put_latest(capture_queue, image)
+
+                # 等待下一次截图
+                # 这样可以避免 CPU 占用过高
+                time.sleep(self.check_interval)
+        except Exception as e:
+            print(f"\n截图出错: {e}")
+            self.is_running = False
+
+    def _ocr_loop(self, capture_queue: queue.Queue, text_queue: queue.Queue) -> None:
+        """
+        识别线程：从截图队列取出图片进行 OCR 识别，把结果放进结果队列
+        """
+        try:
+            while self.is_running:
+                try:
+                    image = capture_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                # 相同的画面直接使用缓存结果，见 OCREngine.recognize_cached()
+                text = self.ocr.recognize_cached(image)
+                put_latest(text_queue, text)
+        except Exception as e:
+            print(f"\n识别出错: {e}")
+            self.is_running = False
+
+    def _handle_text(self, text: str) -> None:
+        """
+        处理一次识别结果：检测新内容，并触发语音播报
+
+        参数说明:
+            text: OCR 识别出的文字
+        """
+        # ----------------------
+        # 第一步：处理识别结果
+        # ----------------------
+
+        # 检查是否识别到文字
+        if not text:
+            return
+
+        # 识别结果已经由 OCREngine.recognize_text() 规范化过
+        # （去掉了空格、空行和首尾空白），这里直接使用
+
+        # 打印日志：显示识别到了多少字符
+        print(f"[监控] 识别到 {len(text)} 字符")
+
+        # ----------------------
+        # 第二步：检测新内容
+        # ----------------------
+
+        # 检查文字是否有变化
+        # 先比较哈希值：内容相同时哈希一定相同，直接走"无变化"分支
+        # 字符串的哈希值由 Python 算一次后缓存在字符串对象里，重复比较几乎没有开销
+        text_hash = hash(text)
+        if text_hash != self.last_text_hash:
+            # 文字变了！
+
+            # 判断是首次识别还是增量更新
+            if not self.last_text:
+                # 第一次识别，没有任何历史内容
+                # 播报全部内容
+                new_content = text
+
+                # 打印日志
+                print(f"[首次] 播报全部内容")
+
+            else:
+                # 不是第一次，有历史内容
+                # 计算新增的部分
+                # new_text = "旧内容" + "新内容"
+                # 所以新内容 = 完整内容 - 旧内容
+                # get_text_diff() 还能容忍 OCR 识别上的小误差，见 OCREngine.get_text_diff()
+                new_content = self.ocr.get_text_diff(self.last_text, text)
+
+                # 打印日志：显示新增内容的长度
+                print(f"[增量] 新增内容长度: {len(new_content)}")
+
+            # ----------------------
+            # 第三步：触发语音播报
+            # ----------------------
+
+            # 检查新增内容是否有效
+            # 至少要有 2 个字符才播报，避免噪音
+            if new_content and len(new_content) >= 2:
+                # 打印新内容（只显示前 30 个字符）
+                print(f"[新内容] {new_content[:30]}...")
+
+                # 加入待播报内容，攒一小段时间后合并提交给语音播报器
+                self._queue_speech(new_content)
+            else:
+                # 内容太短，可能是误识别
+                print(f"[跳过] 内容太短或为空")
+
+            # 更新历史记录
+            # 保存当前内容的结尾部分，作为下一次比较的基础
+            # 哈希值用完整文本计算，判断内容有没有变化不受截断影响
+            self.last_text = text[-self.LAST_TEXT_MAX_CHARS:]
+            self.last_text_hash = text_hash
+
+        else:
+            # 文字没有变化
+            print(f"[相同] 内容无变化")
+
+    def _queue_speech(self, content: str) -> None:
+        """
+        把新内容加入待播报列表
+
+        不是每段新内容都立即调用 tts.speak()，而是先攒起来:
+            - 攒够 SPEAK_BATCH_CHARS 个字，或
+            - 第一段内容已经等了 SPEAK_BATCH_WINDOW 秒
+        时再合并成一句提交，减少播报队列的提交次数，
+        也避免短句被拆成好几段、一段一段地念
+
+        参数说明:
+            content: 新增的内容
+        """
+        if not self._pending:
+            # 第一段内容，开始计时
+            self._pending_since = time.monotonic()
+        self._pending.append(content)
+
+        if sum(map(len, self._pending)) >= self.SPEAK_BATCH_CHARS:
+            self._flush_speech(force=True)
+
+    def _flush_speech(self, force: bool = False) -> None:
+        """
+        提交待播报的内容
+
+        参数说明:
+            force: True = 立即提交
+                   False = 第一段内容等了 SPEAK_BATCH_WINDOW 秒以上才提交
+        """
+        if not self._pending:
+            return
+
+        if force or time.monotonic() - self._pending_since >= self.SPEAK_BATCH_WINDOW:
+            self.tts.speak("".join(self._pending))
+            self._pending.clear()
+
     def stop(self) -> None:
         """
         停止监控
@@ -351,6 +486,8 @@ class ScreenReader:
 
         # 停止语音播报
         # 会清空播报队列，并尝试停止当前正在播放的语音
+        # 还没提交的内容也一起丢弃（提交了也会马上被清空）
+        self._pending.clear()
         self.tts.stop()
 
         # 打印停止信息
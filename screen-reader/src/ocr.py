@@ -30,8 +30,11 @@ Tesseract 是什么？
 
 依赖说明:
     - pytesseract: Python 封装层，让 Python 可以调用 Tesseract
+    - tesserocr（可选）: 直接在进程内调用 Tesseract 库，速度更快
+      没有安装时自动退回 pytesseract
     - Pillow (PIL): Python 图片处理库，用于读取和管理图片
-    - pyautogui: 屏幕截图库，用于截取屏幕区域
+    - OpenCV (cv2) / numpy: 识别前的图片预处理（灰度、缩小、二值化）
+    - mss: 屏幕截图库，用于截取屏幕区域（比 pyautogui 快，少一次复制）
 =================================================================
 """
 
@@ -43,6 +46,38 @@ Tesseract 是什么？
 # 用于检查文件是否存在、判断操作系统类型
 import os
 
+# re: 正则表达式模块
+# 用于一次性清理识别结果中多余的空白
+import re
+
+# hashlib: 哈希算法模块
+# 用于给截图计算一个简短的"指纹"，判断画面是否变化
+import hashlib
+
+# OrderedDict: 有序字典
+# 记住插入/访问顺序，用来实现 LRU（最近最少使用）缓存
+from collections import OrderedDict
+
+# threading: 线程模块
+# mss 截图对象不能跨线程使用，需要每个线程各自创建一个
+# 共用的 tesserocr 识别接口也要靠锁来保护
+import threading
+
+# atexit: 注册程序退出时执行的清理函数
+import atexit
+
+# mss: 快速截屏库
+# 直接返回系统截屏接口得到的原始 BGRA 像素数据
+import mss
+
+# cv2: OpenCV 库
+# 用于识别前的图片预处理（灰度、缩放、二值化），都在 C++ 层完成
+import cv2
+
+# numpy: NumPy 数值计算库
+# 把截图的原始像素数据包装成数组，交给 OpenCV 处理
+import numpy as np
+
 # PIL (Pillow): Python 图片处理库
 # PIL = Python Imaging Library
 # Pillow 是 PIL 的现代维护版本
@@ -53,11 +88,128 @@ from PIL import Image
 # 让我们可以用 Python 代码调用 Tesseract 引擎
 import pytesseract
 
+# tesserocr: Tesseract 的另一种 Python 封装（可选依赖）
+# pytesseract 每识别一次都要启动一个 tesseract 子进程，重新加载识别模型，
+# 光这部分开销就有几十到几百毫秒
+# tesserocr 直接在当前进程里调用 Tesseract 库，模型只加载一次，之后反复使用
+# 没有安装 tesserocr 时，自动使用 pytesseract
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:
+    PyTessBaseAPI = None
+
 # typing: 类型提示模块
 # 用于声明函数参数和返回值的类型
 from typing import Tuple, Optional
 
 
+# 送去识别的图片最长边不超过这么多像素
+# OCR 耗时随像素数量增长，屏幕文字缩到这个尺寸识别准确率几乎不受影响
+MAX_OCR_SIDE = 1280
+
+# 比较新旧文本时，用旧文本结尾多少个字符作为对齐的"锚点"（见 get_text_diff）
+DIFF_ANCHOR_SIZE = 32
+
+# 锚点至少要有这么多个字符才用来对齐
+# 锚点太短（比如一两个字）很容易在新文本里碰巧出现，会把真正的新内容当成旧内容丢掉
+DIFF_MIN_ANCHOR = 8
+
+# 匹配"换行符及其前后的所有空白"（包括连续的空行）
+# 替换成一个换行符，就等于去掉了每行首尾的空白和所有空行
+_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
+# 默认识别语言：繁体中文 + 英文
+DEFAULT_LANG = "chi_tra+eng"
+
+# 自动选择识别语言的阈值（见 OCREngine.pick_lang）
+# 占比是在文字所在的外接矩形里计算的，不受区域四周空白多少的影响
+# 笔画像素占比高于 CHINESE_INK_RATIO: 汉字笔画密，只用中文模型
+# 笔画像素占比低于 ENGLISH_INK_RATIO: 字母笔画稀，只用英文模型
+# 介于两者之间: 拿不准，使用中英文组合模型
+# 两个阈值都取得比较保守，只有差别非常明显时才只用一个模型
+CHINESE_INK_RATIO = 0.30
+ENGLISH_INK_RATIO = 0.10
+
+
+# tesserocr 识别接口缓存（整个进程共用一份）
+# 每个语言模型（比如 chi_tra.traineddata 有几十 MB）只从磁盘加载一次，
+# 即使创建了多个 OCREngine，也不会重复加载
+# 键: (语言代码, PSM, OEM, 语言包目录)
+# 值: (识别接口, 使用这个接口时要加的锁)；值为 None 表示创建失败，改用 pytesseract
+_API_CACHE = {}
+
+# 创建识别接口时加的锁，避免两个线程同时加载同一个模型
+_API_LOCK = threading.Lock()
+
+
+def _get_api(lang: str, tessdata_path: Optional[str] = None):
+    """
+    获取加载了 lang 语言的 tesserocr 识别接口（所有 OCREngine 共用）
+
+    每种语言第一次用到时创建，之后一直复用
+    只在安装了 tesserocr 时创建，否则返回 None
+    参数和 recognize_text() 里 pytesseract 的配置保持一致:
+        PSM.SINGLE_BLOCK = --psm 6（统一的文本块）
+        OEM.DEFAULT = --oem 3（使用可用的引擎）
+        preserve_interword_spaces = 1（保留词之间的空格）
+
+    参数说明:
+        lang: 识别语言代码
+        tessdata_path: 语言包所在目录，None 表示使用 tesserocr 的默认位置
+
+    返回值:
+        (识别接口, 锁)；同一个接口一次只能识别一张图片，使用时要先拿到锁
+        创建失败（比如找不到语言包）时，打印提示并返回 None（退回 pytesseract）
+    """
+    if PyTessBaseAPI is None:
+        return None
+
+    key = (lang, PSM.SINGLE_BLOCK, OEM.DEFAULT, tessdata_path)
+
+    # 先不加锁查一次：接口创建好之后，每次识别都走这里，不用等锁
+    if key in _API_CACHE:
+        return _API_CACHE[key]
+
+    with _API_LOCK:
+        # 拿到锁后再查一次：等锁期间别的线程可能已经创建好了
+        if key in _API_CACHE:
+            return _API_CACHE[key]
+
+        kwargs = {}
+        if tessdata_path is not None:
+            kwargs["path"] = tessdata_path
+
+        try:
+            api = PyTessBaseAPI(lang=lang, psm=PSM.SINGLE_BLOCK,
+                                oem=OEM.DEFAULT, **kwargs)
+            api.SetVariable("preserve_interword_spaces", "1")
+            entry = (api, threading.Lock())
+        except RuntimeError as e:
+            print(f"tesserocr 初始化失败（{lang}），改用 pytesseract: {e}")
+            entry = None
+
+        _API_CACHE[key] = entry
+        return entry
+
+
+def release_apis() -> None:
+    """
+    释放所有共用的 tesserocr 识别接口
+
+    程序退出时自动调用；之后再识别会重新创建
+    """
+    with _API_LOCK:
+        for entry in _API_CACHE.values():
+            if entry is not None:
+                api, lock = entry
+                with lock:
+                    api.End()
+        _API_CACHE.clear()
+
+
+atexit.register(release_apis)
+
+
 class OCREngine:
     """
     OCR 引擎
@@ -94,10 +246,27 @@ class OCREngine:
         初始化时会:
             1. 保存 Tesseract 路径
             2. 调用 _configure_tesseract() 配置引擎
+            3. 如果安装了 tesserocr，提前加载共用的识别接口
         """
         # 调用配置方法，设置 Tesseract 的路径
         self._configure_tesseract(tesseract_path)
 
+        # 提前加载默认语言的 tesserocr 识别接口（所有 OCREngine 共用，见 _get_api）
+        self._api_for(DEFAULT_LANG)
+
+        # 每个线程各自的 mss 截图对象（见 _get_sct）
+        self._local = threading.local()
+
+        # 识别结果缓存
+        # 键: 截图内容的哈希值（指纹）
+        # 值: 这张图识别出的文字
+        # 屏幕内容没变时，截图完全相同，直接返回缓存结果，不必再跑一遍 OCR
+        self._text_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+        # 缓存最多保存多少条结果
+        # 超过后删除最久没用过的那条
+        self._cache_size = 8
+
     def _configure_tesseract(self, tesseract_path: Optional[str] = None) -> None:
         """
         配置 Tesseract 路径
@@ -138,6 +307,9 @@ class OCREngine:
             # Tesseract 存在，配置 pytesseract 使用这个路径
             # pytesseract.pytesseract.tesseract_cmd 是 Tesseract 的可执行文件路径
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+            # 记下路径，tesserocr 需要用它找到语言包目录
+            self.tesseract_path = tesseract_path
         else:
             # Tesseract 不存在，抛出错误
             # FileNotFoundError 是 Python 内置异常，表示文件未找到
@@ -146,11 +318,38 @@ class OCREngine:
                 "请从 https://github.com/UB-Mannheim/tesseract/wiki 下载安装"
             )
 
+    def _api_for(self, lang: str):
+        """
+        获取加载了 lang 语言的 tesserocr 识别接口
+
+        识别接口由模块级的 _get_api() 统一管理，同一进程里的所有 OCREngine 共用
+        这里只负责算出语言包所在的目录
+        """
+        # Windows 安装版的语言包在 tesseract.exe 同目录的 tessdata 文件夹里
+        # 其他系统使用 tesserocr 的默认位置
+        tessdata_path = None
+        if os.name == "nt":
+            tessdata_path = os.path.join(os.path.dirname(self.tesseract_path), "tessdata")
+        return _get_api(lang, tessdata_path)
+
+    def _get_sct(self) -> "mss.base.MSSBase":
+        """
+        获取当前线程的 mss 截图对象
+
+        mss 对象内部保存了系统截屏用的句柄，只能在创建它的线程里使用
+        所以每个线程第一次截图时创建一个，之后一直复用
+        """
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+
     def capture_region(self, region: Tuple[int, int, int, int]) -> Image.Image:
         """
         截取屏幕指定区域
 
-        这个方法使用 pyautogui 库截取屏幕的指定区域
+        这个方法使用 mss 库截取屏幕的指定区域
 
         参数说明:
             region: 区域坐标，格式为 (x, y, width, height)
@@ -161,31 +360,112 @@ class OCREngine:
 
         返回值:
             PIL Image 对象
-            包含截取区域的图片
+            包含截取区域的黑白（二值化）图片（最长边不超过 MAX_OCR_SIDE）
+
+        预处理说明:
+            1. 灰度: 转成单通道灰度图
+               彩色信息对识别文字没有帮助
+               单通道的数据量只有 RGB 的三分之一
+            2. 缩小: 截图最长边超过 MAX_OCR_SIDE 时按比例缩小
+               高分屏截图往往比 Tesseract 需要的大好几倍，缩小后识别更快
+            3. 二值化: 用 OpenCV 的自适应阈值把图片变成纯黑白
+               Tesseract 识别前本来也要做这一步，
+               提前用 OpenCV 做好，Tesseract 拿到的已经是干净的黑白图
+               自适应阈值按每个像素周围 31x31 的区域分别计算阈值，
+               背景明暗不均（比如半透明的聊天框）时也能分清文字和背景
 
         使用示例:
             # 截取屏幕左上角 100x100 像素的区域
             region = (0, 0, 100, 100)
             image = ocr.capture_region(region)
 
-        pyautogui 是什么？
-            pyautogui 是一个控制鼠标和键盘的 Python 库
-            也可以用来截取屏幕截图
-            screenshot() 方法可以截取整个屏幕或指定区域
+        mss 是什么？
+            mss 是一个专门做屏幕截图的 Python 库
+            grab() 直接返回系统截屏接口得到的 BGRA 原始像素（保存在 raw 这个 bytearray 里）
+            这里用 np.frombuffer 把 raw 直接看作数组，不复制；
+            之后 cvtColor 转灰度时才生成新的单通道图片，
+            缩小、二值化都在这张灰度图上进行，最后 Image.fromarray 生成 PIL 图片
+            （注意 raw.bgra 每次访问都会复制一份 bytes，所以这里不用它）
         """
-        # 导入 pyautogui 模块
-        # 在函数内部导入可以避免在文件开头产生依赖
-        import pyautogui
+        # mss 的区域格式是字典: 左上角坐标 + 宽高
+        x, y, width, height = region
+        monitor = {"left": x, "top": y, "width": width, "height": height}
 
         # 截取屏幕区域
-        # pyautogui.screenshot() 的参数 region 是一个四元组
-        # (x, y, width, height)
-        screenshot = pyautogui.screenshot(region=region)
+        raw = self._get_sct().grab(monitor)
+
+        # 把 BGRA 原始数据直接看作 (高, 宽, 4) 的数组，不复制
+        # raw.raw 是 mss 内部保存像素的 bytearray；raw.bgra 会先复制成 bytes，所以不用它
+        width, height = raw.size
+        frame = np.frombuffer(raw.raw, dtype=np.uint8).reshape(height, width, 4)
+
+        # 第一步：转成灰度图（单通道 8 位）
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+
+        # 第二步：计算缩放比例（不放大，只缩小）
+        scale = min(MAX_OCR_SIDE / width, MAX_OCR_SIDE / height, 1.0)
+        if scale < 1.0:
+            # INTER_LINEAR: 双线性插值，速度快，缩小文字效果也够好
+            gray = cv2.resize(
+                gray,
+                (max(1, int(width * scale)), max(1, int(height * scale))),
+                interpolation=cv2.INTER_LINEAR
+            )
+
+        # 第三步：自适应阈值二值化
+        # 参数: 最大值 255、高斯加权的邻域、普通二值化、邻域大小 31、阈值偏移 10
+        binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY, 31, 10)
+
+        # 包装成 PIL 图片（"L" 模式 = 单通道 8 位），pytesseract 可以直接使用
+        return Image.fromarray(binary)
 
-        # 返回截取的图片
-        return screenshot
+    def pick_lang(self, image: Image.Image) -> str:
+        """
+        根据图片里笔画的疏密，选择识别语言
+
+        同时加载中英文两个模型识别，耗时差不多是单一语言的两倍
+        汉字笔画多，文字所在范围内"笔画像素"的占比明显高于英文字母，
+        据此在内容明显只有一种文字时，只用一个模型；拿不准时使用默认的中英文组合
 
-    def recognize_text(self, image: Image.Image, lang: str = "chi_tra+eng") -> str:
+        参数说明:
+            image: 二值化后的 PIL 图片（capture_region() 的返回值）
+
+        返回值:
+            语言代码: "chi_tra"、"eng" 或 DEFAULT_LANG（拿不准时）
+        """
+        # 只对黑白（单通道）图片判断，其他图片直接用默认语言
+        if image.mode != "L":
+            return DEFAULT_LANG
+
+        pixels = np.asarray(image)
+        if not pixels.size:
+            return DEFAULT_LANG
+
+        # 文字可能是白底黑字，也可能是黑底白字
+        # 笔画总是占少数，取黑、白两种像素中较少的那种作为笔画
+        white = cv2.countNonZero(pixels)
+        if white > pixels.size - white:
+            # 白色是背景，反转后笔画变成非零像素
+            ink = cv2.bitwise_not(pixels)
+        else:
+            ink = pixels
+
+        # 只在文字所在的外接矩形里计算占比
+        # 整个区域里空白边距的多少和文字种类无关，不裁掉的话占比主要反映的是边距大小
+        x, y, w, h = cv2.boundingRect(ink)
+        if w == 0 or h == 0:
+            # 没有笔画（纯色图片），用默认语言
+            return DEFAULT_LANG
+        ink_ratio = cv2.countNonZero(ink[y:y + h, x:x + w]) / (w * h)
+
+        if ink_ratio > CHINESE_INK_RATIO:
+            return "chi_tra"
+        if ink_ratio < ENGLISH_INK_RATIO:
+            return "eng"
+        return DEFAULT_LANG
+
+    def recognize_text(self, image: Image.Image, lang: str = DEFAULT_LANG) -> str:
         """
         识别图片中的文字
 
@@ -200,7 +480,7 @@ class OCREngine:
                   可以组合使用，如 "chi_tra+eng" 同时识别中文和英文
 
         返回值:
-            识别出的文字字符串
+            识别出的文字字符串（已去掉所有空格和空行）
             如果图片中没有文字，返回空字符串
 
         Tesseract 配置参数说明:
@@ -237,33 +517,43 @@ class OCREngine:
                 保留词之间的空格
                 1 = 启用，0 = 禁用
         """
-        # 构建 Tesseract 配置字符串
-        # 这些参数告诉 Tesseract 如何处理图片
-        config = "--psm 6 --oem 3 -c preserve_interword_spaces=1"
-
-        # 调用 Tesseract 识别文字
-        # pytesseract.image_to_string() 是主要函数
-        # 参数:
-        #   image: 要识别的图片
-        #   lang: 语言代码
-        #   config: 配置参数
-        text = pytesseract.image_to_string(image, lang=lang, config=config)
+        entry = self._api_for(lang)
+        if entry is not None:
+            # 使用常驻的 tesserocr 接口识别
+            # 不启动子进程，也不重新加载模型
+            # 接口是共用的，设置图片和取结果之间不能被别的线程打断
+            api, lock = entry
+            with lock:
+                if image.mode == "L":
+                    # 单通道图片直接把像素数据交给 Tesseract
+                    # 参数: 像素数据、宽、高、每像素字节数、每行字节数
+                    width, height = image.size
+                    api.SetImageBytes(image.tobytes(), width, height, 1, width)
+                else:
+                    api.SetImage(image)
+                text = api.GetUTF8Text()
+        else:
+            # 构建 Tesseract 配置字符串
+            # 这些参数告诉 Tesseract 如何处理图片
+            config = "--psm 6 --oem 3 -c preserve_interword_spaces=1"
+
+            # 调用 Tesseract 识别文字
+            # pytesseract.image_to_string() 是主要函数
+            # 参数:
+            #   image: 要识别的图片
+            #   lang: 语言代码
+            #   config: 配置参数
+            text = pytesseract.image_to_string(image, lang=lang, config=config)
 
         # 清理识别结果
         # ======================
 
-        # 1. 按换行符分割成行
-        # 2. 对每行去除首尾空白
-        # 3. 过滤掉空行
-        # 4. 重新用换行符连接
-
-        # text.split('\n') 按换行符分割，得到一个列表
-        # [line.strip() for line in ...] 对每行应用 strip()，去除首尾空白
-        # if line.strip() 过滤掉空白行
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-        # '\n'.join(lines) 用换行符把行连接起来
-        text = '\n'.join(lines)
+        # 1. 去除每行首尾的空白，去掉空行
+        #    用正则把"换行符及其前后的空白"整体替换成一个换行符，
+        #    一次扫描完成，不用先拆成很多行再逐行处理
+        # 2. 去除整段文字首尾的空白
+        # 3. 移除所有空格（OCR 可能会在汉字之间加空格）
+        text = _LINE_BREAK_RE.sub("\n", text).strip().replace(" ", "")
 
         # 返回清理后的结果
         return text
@@ -286,7 +576,7 @@ class OCREngine:
 
         工作流程:
             1. 调用 capture_region() 截取指定区域的图片
-            2. 调用 recognize_text() 识别图片中的文字
+            2. 调用 recognize_cached() 识别图片中的文字（相同的图片直接用缓存结果）
             3. 返回识别结果
 
         使用示例:
@@ -299,7 +589,50 @@ class OCREngine:
         image = self.capture_region(region)
 
         # 第二步：识别图片中的文字
-        return self.recognize_text(image)
+        return self.recognize_cached(image)
+
+    def recognize_cached(self, image: Image.Image) -> str:
+        """
+        识别图片中的文字（带缓存）
+
+        参数说明:
+            image: PIL Image 对象，通常是 capture_region() 的返回值
+
+        返回值:
+            识别出的文字字符串
+
+        工作流程:
+            1. 计算图片内容的哈希值，如果之前识别过同样的图片，直接返回缓存结果
+            2. 否则用 pick_lang() 选择识别语言，
+               调用 recognize_text() 识别图片中的文字，并存入缓存
+
+        为什么要缓存？
+            OCR 识别一次要几百毫秒，而监控循环每 0.5 秒就截一次图
+            大多数时候屏幕内容没有变化，截图一模一样
+            计算哈希只要零点几毫秒，命中缓存就省掉了整次 OCR
+        """
+        # 第一步：计算图片指纹
+        # image.tobytes() 取出原始像素数据
+        # blake2b 是很快的哈希算法，digest_size=8 表示只要 8 字节的结果
+        # 图片尺寸也放进键里，避免不同尺寸的图片像素数据恰好相同
+        key = hashlib.blake2b(image.tobytes(), digest_size=8).digest() + \
+            f"{image.size}".encode()
+
+        # 第二步：查缓存
+        if key in self._text_cache:
+            # 命中：把这条移到末尾，表示"最近刚用过"
+            self._text_cache.move_to_end(key)
+            return self._text_cache[key]
+
+        # 第三步：没有命中，选择语言并识别图片中的文字
+        text = self.recognize_text(image, self.pick_lang(image))
+
+        # 存入缓存，超出容量时删除最久没用过的（最前面的）那条
+        self._text_cache[key] = text
+        if len(self._text_cache) > self._cache_size:
+            self._text_cache.popitem(last=False)
+
+        return text
 
     def get_text_diff(self, old_text: str, new_text: str) -> str:
         """
@@ -322,7 +655,12 @@ class OCREngine:
             1. 如果新文本为空，返回空字符串
             2. 如果旧文本为空，返回整个新文本
             3. 如果新文本以旧文本开头，返回新增的部分
-            4. 否则（内容完全不同），返回整个新文本
+            4. 否则用旧文本的最后 DIFF_ANCHOR_SIZE 个字符（旧文本较短时取后一半）当"锚点"，
+               在新文本里找它最后出现的位置，返回锚点之后的部分
+               （OCR 偶尔认错、漏掉前面的某个字，或者前面的内容滚动出了区域，
+               只要结尾还对得上，就仍然只播报新增的内容）
+               锚点不足 DIFF_MIN_ANCHOR 个字符时不做这一步（太短的锚点容易碰巧匹配）
+            5. 锚点太短或找不到（内容完全不同），返回整个新文本
 
         使用示例:
             old = "今天天气"
@@ -334,6 +672,16 @@ class OCREngine:
             new = "world"
             diff = ocr.get_text_diff(old, new)
             # diff = "world"（因为内容完全不同）
+
+            old = "第一条消息：你好第二条消息：再见"
+            new = "第l条消息：你好第二条消息：再见第三条消息：晚安"  # "一" 被认成了 "l"
+            diff = ocr.get_text_diff(old, new)
+            # diff = "第三条消息：晚安"（靠结尾的锚点对齐）
+
+            old = "你好"
+            new = "好久不见"
+            diff = ocr.get_text_diff(old, new)
+            # diff = "好久不见"（旧文本太短，不用锚点对齐）
         """
         # 检查新文本是否为空
         if not new_text:
@@ -354,7 +702,20 @@ class OCREngine:
             #   new_text = "今天天气真好"
             #   新增 = "真好"
             return new_text[len(old_text):].strip()
-        else:
-            # 内容完全不同，返回整个新文本
-            # 这种情况可能是因为区域内容发生了重大变化
-            return new_text
+
+        # 开头对不上，用旧文本的结尾做锚点
+        # 旧文本较短时只取后一半，否则整段旧文本都当锚点，就和上面的 startswith 没区别了
+        # 锚点太短时容易在新文本里碰巧出现，不用它对齐
+        anchor_size = min(DIFF_ANCHOR_SIZE, len(old_text) // 2)
+        if anchor_size >= DIFF_MIN_ANCHOR:
+            anchor = old_text[-anchor_size:]
+
+            # str.rfind() 在 C 层查找子串，返回最后一次出现的位置，找不到返回 -1
+            position = new_text.rfind(anchor)
+            if position >= 0:
+                # 找到了：锚点之后的内容就是新增部分
+                return new_text[position + len(anchor):].strip()
+
+        # 内容完全不同，返回整个新文本
+        # 这种情况可能是因为区域内容发生了重大变化
+        return new_text
@@ -19,12 +19,12 @@
     5. 用户按 Enter 确认后，返回区域坐标
 
 技术实现:
-    - pyautogui: 用于截取屏幕截图
+    - mss: 用于截取屏幕截图
     - OpenCV (cv2): 用于创建窗口、绘制图形、处理图像
     - NumPy: 用于处理图像数据
 
 依赖说明:
-    - pyautogui: 屏幕截图和鼠标控制
+    - mss: 快速截屏库
     - cv2 (OpenCV): 计算机视觉库，用于窗口和图形绘制
     - numpy: NumPy 数值计算库，用于处理图像数组
 
@@ -42,9 +42,16 @@
 # 导入必要的模块
 # ======================
 
-# pyautogui: 屏幕截图和鼠标/键盘控制库
-# screenshot() 方法可以截取屏幕图片
-import pyautogui
+# os: 操作系统相关功能
+# 用来判断是不是 Windows 系统
+import os
+
+# ctypes: 调用系统动态库（这里用来调用 Windows 的 user32/shcore 接口）
+import ctypes
+
+# mss: 快速截屏库
+# 直接返回系统截屏接口得到的原始 BGRA 像素数据，OpenCV 正好使用 BGR 顺序
+import mss
 
 # cv2: OpenCV 库
 # 用于创建窗口、显示图片、绘制图形、处理图像
@@ -55,11 +62,69 @@ import cv2
 # 用于处理图像数据（图像在内存中以 NumPy 数组形式存储）
 import numpy as np
 
+# types: Python 内置类型模块
+# SimpleNamespace 是一个简单的"属性容器"，可以用 obj.name 的方式读写字段
+from types import SimpleNamespace
+
 # typing: 类型提示模块
 # 用于声明函数参数和返回值的类型
 from typing import Tuple, Optional
 
 
+# 遮罩变暗的程度：选区外的像素每个通道乘以这个系数（亮度降低 30%）
+DIM_ALPHA = 0.7
+
+# 变暗用的查找表：下标是原来的亮度 0~255，值是变暗后的亮度
+# 只有 256 种可能的输入，提前算好，变暗时每个像素查一次表即可，全程都是 uint8 整数
+_DIM_LUT = np.round(np.arange(256) * DIM_ALPHA).astype(np.uint8)
+
+# 选择框边框的粗细（像素）
+RECT_THICKNESS = 2
+
+# 选择窗口里显示的截图最宽多少像素
+# 4K 等大屏幕的截图先缩小到这个宽度再显示和绘制，每帧要处理的像素只有原来的四分之一，
+# 全屏窗口会把它放大铺满屏幕；确认选区后再把坐标换算回原始屏幕像素
+PREVIEW_MAX_WIDTH = 1920
+
+
+def _enable_dpi_awareness() -> None:
+    """
+    让程序按"每个显示器单独感知 DPI"的方式运行（只在 Windows 上有效）
+
+    高分辨率屏幕开启了缩放（比如 150%）时，不感知 DPI 的程序拿到的是系统缩放过的虚拟像素，
+    截图会被 Windows 先缩小一遍，全屏窗口又要再放大一遍，鼠标坐标也和真实像素对不上
+    开启后截图、选择窗口和鼠标坐标都直接使用屏幕的真实像素
+    """
+    if os.name != "nt":
+        return
+
+    try:
+        # -4 = DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2（Windows 10 1703 及以上）
+        ctypes.windll.user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(-4))
+    except (AttributeError, OSError):
+        try:
+            # 2 = PROCESS_PER_MONITOR_DPI_AWARE（Windows 8.1 及以上）
+            ctypes.windll.shcore.SetProcessDpiAwareness(2)
+        except (AttributeError, OSError):
+            # 更老的系统只能设置为感知系统 DPI
+            ctypes.windll.user32.SetProcessDPIAware()
+
+
+# 导入模块时就设置好，必须在创建任何窗口、截图之前
+_enable_dpi_awareness()
+
+
+def _clip_rect(x0: int, y0: int, x1: int, y1: int,
+               width: int, height: int) -> Tuple[int, int, int, int]:
+    """
+    把矩形 [x0, x1) × [y0, y1) 限制在 width × height 的图像范围内
+
+    避免负数下标从另一头切片
+    """
+    return (max(0, min(x0, width)), max(0, min(y0, height)),
+            max(0, min(x1, width)), max(0, min(y1, height)))
+
+
 class RegionSelector:
     """
     屏幕区域选择器
@@ -105,22 +170,33 @@ class RegionSelector:
         这个方法创建选择器并初始化内部状态
 
         初始化的内容:
-            1. coords: 存储坐标信息的字典
-            2. window_name: 窗口标题
+            1. coords: 存储坐标信息的对象
+            2. scale: 显示的截图相对屏幕的缩放比例
+            3. window_name: 窗口标题
         """
-        # 坐标字典，存储选择过程中的各种坐标
-        self.coords = {
-            "ix": -1,      # 起始点的 X 坐标
-            "iy": -1,      # 起始点的 Y 坐标
-            "x_end": -1,   # 结束点的 X 坐标
-            "y_end": -1,   # 结束点的 Y 坐标
-            "drawing": False  # 是否正在拖拽中
-        }
+        # 坐标对象，存储选择过程中的各种坐标
+        # 鼠标移动时回调函数会频繁更新这些字段，
+        # 用属性读写（coords.ix）比字典按字符串键查找更快
+        self.coords = SimpleNamespace(
+            ix=-1,          # 起始点的 X 坐标
+            iy=-1,          # 起始点的 Y 坐标
+            x_end=-1,       # 结束点的 X 坐标
+            y_end=-1,       # 结束点的 Y 坐标
+            drawing=False   # 是否正在拖拽中
+        )
+
+        # 画面是否需要重绘
+        # 鼠标回调在坐标真正变化时设为 True，主循环重绘后设回 False
+        self._dirty = True
+
+        # 显示的截图相对屏幕的缩放比例（见 PREVIEW_MAX_WIDTH）
+        # 1.0 表示没有缩放
+        self.scale = 1.0
 
         # 窗口标题
         self.window_name = "选择播报区域 - 按 Enter/C 确认, Esc 退出"
 
-    def _mouse_callback(self, event: int, x: int, y: int, flags: int, param: dict) -> None:
+    def _mouse_callback(self, event: int, x: int, y: int, flags: int, param: SimpleNamespace) -> None:
         """
         鼠标回调函数
 
@@ -128,18 +204,23 @@ class RegionSelector:
         每当鼠标发生特定事件时，OpenCV 会调用这个函数
         """
         if event == cv2.EVENT_LBUTTONDOWN:
-            if not param["drawing"]:
-                param["drawing"] = True
-                param["ix"], param["iy"] = x, y
-                param["x_end"], param["y_end"] = x, y
+            if not param.drawing:
+                param.drawing = True
+                param.ix, param.iy = x, y
+                param.x_end, param.y_end = x, y
+                self._dirty = True
 
         elif event == cv2.EVENT_MOUSEMOVE:
-            if param["drawing"]:
-                param["x_end"], param["y_end"] = x, y
+            # 只在拖拽中、而且位置确实变了时才需要重绘
+            # 鼠标抖动时会连续报告相同的位置，这些事件直接忽略
+            if param.drawing and (x != param.x_end or y != param.y_end):
+                param.x_end, param.y_end = x, y
+                self._dirty = True
 
         elif event == cv2.EVENT_LBUTTONUP:
-            param["drawing"] = False
-            param["x_end"], param["y_end"] = x, y
+            param.drawing = False
+            param.x_end, param.y_end = x, y
+            self._dirty = True
 
     def select_region(self) -> Optional[Tuple[int, int, int, int]]:
         """
@@ -149,42 +230,89 @@ class RegionSelector:
             如果用户确认选择，返回 (x, y, width, height)
             如果用户取消选择，返回 None
         """
-        # 截取屏幕
-        screenshot = pyautogui.screenshot()
-        img = np.array(screenshot)
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+        # 截取主屏幕
+        # mss 返回的像素是 BGRA 顺序，直接用 np.frombuffer 套在原始数据 shot.raw 上（不复制），
+        # 再切掉 A 通道就是 OpenCV 使用的 BGR 图像，不需要再做颜色转换
+        # （shot.bgra 每次访问都会把整屏数据复制成 bytes，所以不用它）
+        with mss.mss() as sct:
+            shot = sct.grab(sct.monitors[1])
+        img = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)[:, :, :3]
+
+        # 屏幕很宽时缩小截图，之后的绘制都在缩小后的图上进行
+        # INTER_AREA 适合缩小图片，文字边缘不会出现锯齿
+        self.scale = min(1.0, PREVIEW_MAX_WIDTH / shot.width)
+        if self.scale < 1.0:
+            img = cv2.resize(img, None, fx=self.scale, fy=self.scale,
+                             interpolation=cv2.INTER_AREA)
 
         # 创建全屏窗口
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.setWindowProperty(self.window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
         cv2.setMouseCallback(self.window_name, self._mouse_callback, param=self.coords)
 
+        # 第一轮循环先显示截图
+        # 之后只有鼠标回调把 _dirty 设为 True 时才重新绘制，鼠标没动时画面不会变化
+        self._dirty = True
+
+        height, width = img.shape[:2]
+
+        # 整屏变暗后的背景，只计算一次，拖拽过程中一直复用
+        # cv2.LUT 按查找表替换每个像素，不经过浮点运算，在 C++ 层一遍完成
+        darkened = cv2.LUT(img, _DIM_LUT)
+
+        # 显示用的画布，只分配一次，还没有选区时显示原始截图
+        # （没有缩放时 img 是切片视图，内存不连续；np.empty_like 得到的画布是连续的，可以直接在上面绘制）
+        canvas = np.empty_like(img)
+        np.copyto(canvas, img)
+
+        # 上一次在画布上改动过的矩形 (x0, y0, x1, y1)
+        # 选区变化时只需要把这一块恢复成变暗的背景，不用重新复制整屏
+        # None 表示画布还是原始截图
+        dirty = None
+
+        coords = self.coords
+
         while True:
-            img_copy = img.copy()
-
-            # 绘制选中的矩形
-            if self.coords["drawing"]:
-                cv2.rectangle(
-                    img_copy,
-                    (self.coords["ix"], self.coords["iy"]),
-                    (self.coords["x_end"], self.coords["y_end"]),
-                    (0, 255, 0),
-                    2
-                )
-            elif self.coords["ix"] != -1 and self.coords["iy"] != -1:
-                cv2.rectangle(
-                    img_copy,
-                    (self.coords["ix"], self.coords["iy"]),
-                    (self.coords["x_end"], self.coords["y_end"]),
-                    (0, 255, 0),
-                    2
-                )
-
-            # 绘制遮罩效果
-            self._draw_mask(img_copy)
-
-            cv2.imshow(self.window_name, img_copy)
-            key = cv2.waitKey(1) & 0xFF
+            # 每次循环开始时把坐标读到局部变量里，下面都用局部变量
+            # （鼠标回调只会在 waitKey 里执行，这一轮绘制期间坐标不会变）
+            ix, iy = coords.ix, coords.iy
+            x_end, y_end = coords.x_end, coords.y_end
+
+            if self._dirty:
+                self._dirty = False
+
+                if ix != -1:
+                    if dirty is None:
+                        # 第一次出现选区，整屏变暗一次
+                        np.copyto(canvas, darkened)
+                    else:
+                        # 把上一次的选区和边框恢复成变暗的背景
+                        x0, y0, x1, y1 = dirty
+                        canvas[y0:y1, x0:x1] = darkened[y0:y1, x0:x1]
+
+                    # 选区内恢复原始亮度
+                    # （选区包含边框所在的像素，所以右、下边界要 +1）
+                    x0, y0, x1, y1 = _clip_rect(
+                        min(ix, x_end), min(iy, y_end),
+                        max(ix, x_end) + 1, max(iy, y_end) + 1,
+                        width, height
+                    )
+                    canvas[y0:y1, x0:x1] = img[y0:y1, x0:x1]
+
+                    # 边框会画到选区外面一点，记录改动范围时向外扩出边框的粗细
+                    dirty = _clip_rect(x0 - RECT_THICKNESS, y0 - RECT_THICKNESS,
+                                       x1 + RECT_THICKNESS, y1 + RECT_THICKNESS,
+                                       width, height)
+
+                    # 绘制选中的矩形
+                    # （按下鼠标时 ix、iy 会同时设置，拖拽中和拖拽结束都走这里）
+                    cv2.rectangle(canvas, (ix, iy), (x_end, y_end),
+                                  (0, 255, 0), RECT_THICKNESS)
+
+                cv2.imshow(self.window_name, canvas)
+
+            # 每次最多等 33 毫秒（约 30 帧/秒），等待期间线程休眠，鼠标事件照常处理
+            key = cv2.waitKey(33) & 0xFF
 
             # Esc 退出
             if key == 27:
@@ -193,54 +321,22 @@ class RegionSelector:
 
             # Enter 或 C 确认
             if key == 13 or key == ord("c"):
-                if (self.coords["ix"] != -1 and self.coords["iy"] != -1 and
-                    self.coords["x_end"] != -1 and self.coords["y_end"] != -1):
+                if (coords.ix != -1 and coords.iy != -1 and
+                    coords.x_end != -1 and coords.y_end != -1):
                     break
 
         cv2.destroyAllWindows()
         return self._get_roi_coordinates()
 
-    def _draw_mask(self, img: np.ndarray) -> None:
-        """
-        绘制遮罩效果
-
-        未选中的区域会变暗，突出显示选中的区域
-        """
-        if self.coords["ix"] == -1:
-            return
-
-        # 创建遮罩
-        mask = np.zeros(img.shape, dtype=np.uint8)
-        roi_corners = np.array([[(
-            self.coords["ix"],
-            self.coords["iy"]
-        ), (
-            self.coords["x_end"],
-            self.coords["iy"]
-        ), (
-            self.coords["x_end"],
-            self.coords["y_end"]
-        ), (
-            self.coords["ix"],
-            self.coords["y_end"]
-        )]], dtype=np.int32)
-
-        channel_count = img.shape[2]
-        ignore_mask_color = (255,) * channel_count
-        cv2.fillPoly(mask, roi_corners, ignore_mask_color)
-
-        # 反转遮罩并应用变暗效果
-        inverse_mask = cv2.bitwise_not(mask)
-        opacity = -0.3
-        cv2.addWeighted(inverse_mask, opacity, img, 1, 0, img)
-
     def _get_roi_coordinates(self) -> Tuple[int, int, int, int]:
         """
         获取标准化后的区域坐标
+
+        鼠标坐标是在（可能缩小过的）截图上的坐标，这里除以 scale 换算回屏幕像素
         """
-        x_start = min(self.coords["ix"], self.coords["x_end"])
-        y_start = min(self.coords["iy"], self.coords["y_end"])
-        width = abs(self.coords["x_end"] - self.coords["ix"])
-        height = abs(self.coords["y_end"] - self.coords["iy"])
+        x_start = round(min(self.coords.ix, self.coords.x_end) / self.scale)
+        y_start = round(min(self.coords.iy, self.coords.y_end) / self.scale)
+        width = round(abs(self.coords.x_end - self.coords.ix) / self.scale)
+        height = round(abs(self.coords.y_end - self.coords.iy) / self.scale)
 
         return (x_start, y_start, width, height)
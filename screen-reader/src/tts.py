@@ -22,6 +22,8 @@
     - win32com.client: Windows COM 组件，用于调用系统语音引擎
     - pythoncom: Python 的 COM 库，处理 Windows 组件通信
     - threading: 线程模块，让播报在后台运行，不阻塞主程序
+    - queue: 线程安全的队列，播报线程在队列为空时阻塞等待
+    - utils: 通用工具（put_latest）
 =================================================================
 """
 
@@ -40,6 +42,59 @@ import pythoncom
 # 线程就像是一条独立的工作流水线，可以让播报和监控同时进行
 import threading
 
+# queue: 线程安全的队列
+# get() 在队列为空时让线程休眠等待，有新内容放进来会立即被唤醒
+# 不需要自己加锁，也不需要定时轮询
+import queue
+
+# logging: 日志模块
+# 播报线程里的调试信息用 log.debug() 输出，默认不显示
+# 没开启调试级别时，log.debug() 只做一次级别判断就返回，不会写控制台
+import logging
+
+# 通用工具：队列满了丢掉最旧元素的 put_latest
+from utils import put_latest
+
+
+# SAPI Speak() 的标志位
+# SVSF_ASYNC: 异步播报，Speak() 立即返回，不等播报结束
+# SVSF_PURGE_BEFORE_SPEAK: 先清除当前正在播报和排队的语音
+SVSF_ASYNC = 1
+SVSF_PURGE_BEFORE_SPEAK = 2
+
+# 播报过程中每隔多少毫秒检查一次是否需要停止
+SPEAK_POLL_MS = 100
+
+# 播报队列最多保留多少条待播报的内容
+# 播报跟不上时丢掉最旧的，屏幕阅读更看重播报的是不是最新内容
+MAX_PENDING = 8
+
+# 查找中文语音时交给 SAPI 的筛选条件（见 TTSPlayer._init_voice）
+# 必须满足: 语言为简体中文（804 是简体中文的语言代码）
+# 优先选择: 微软 Huihui 中文女声
+VOICE_REQUIRED_ATTRS = "Language=804"
+VOICE_OPTIONAL_ATTRS = "Name=Microsoft Huihui Desktop"
+
+# 本模块的日志记录器
+# 需要查看播报过程时，在主程序里调用:
+#     logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger("tts")
+
+# 记录当前线程是否已经初始化过 COM 环境（每个线程各自一份）
+_com_state = threading.local()
+
+
+def _ensure_com_initialized() -> None:
+    """
+    在当前线程初始化 COM 环境，每个线程只初始化一次
+
+    COM 组件需要先在所在线程里调用 CoInitialize() 才能使用
+    同一个线程重复调用没有必要，所以用线程局部变量记住是否已经初始化过
+    """
+    if not getattr(_com_state, "initialized", False):
+        pythoncom.CoInitialize()
+        _com_state.initialized = True
+
 
 class TTSPlayer:
     """
@@ -68,9 +123,8 @@ class TTSPlayer:
         初始化时会发生:
             1. 保存语速和音量设置
             2. 创建一个空的播报队列（用来存放待播报的消息）
-            3. 创建线程锁（防止多线程同时操作队列导致出错）
-            4. 设置运行标志为 True
-            5. 启动后台播报线程
+            3. 设置运行标志为 True
+            4. 启动后台播报线程
         """
         # 语速设置
         self.rate = rate
@@ -79,13 +133,15 @@ class TTSPlayer:
         self.volume = volume
 
         # 播报队列：用来存放等待播报的文字
-        # 列表中的每一项就是要播报的一句话
-        self._queue = []
+        # 队列中的每一项就是要播报的一句话
+        # queue.Queue 自带锁，多个线程同时放入、取出也不会混乱
+        # 取出第一条是 O(1) 的，不像 list.pop(0) 要移动后面所有元素
+        # 最多保留 MAX_PENDING 条，满了就丢掉最旧的（见 utils.put_latest）
+        self._queue = queue.Queue(maxsize=MAX_PENDING)
 
-        # 线程锁：保护队列的互斥锁
-        # 当一个线程在操作队列时，其他线程必须等待
-        # 这样保证队列数据不会混乱
-        self._lock = threading.Lock()
+        # 最近一次加入队列的文字
+        # 和它相同的文字不再重复加入队列
+        self._last_text = None
 
         # 运行标志：控制播报线程是否继续运行
         # True = 继续运行，False = 停止
@@ -94,6 +150,18 @@ class TTSPlayer:
         # 播报线程对象
         self._thread = None
 
+        # 配置好的语音对象（语速、音量、中文语音都已设置）
+        # 由播报线程第一次播报时创建，之后每次播报都复用
+        # COM 对象只能在创建它的线程里使用，所以不在这里创建
+        self._voice = None
+
+        # 选中的中文语音（SAPI 语音令牌），None 表示使用系统默认语音
+        self._voice_token = None
+
+        # 系统语音列表的缓存（见 get_available_voices）
+        # None 表示还没有获取过
+        self._voices_cache = None
+
         # 启动后台播报线程
         # 这一步会让播报线程开始工作，不断检查队列
         self._start_thread()
@@ -120,14 +188,15 @@ class TTSPlayer:
         # 调用 start() 后，线程就开始执行 _speak_thread 方法了
         self._thread.start()
 
-        # 打印日志，告诉用户线程已启动
-        print("[TTS] 后台线程已启动")
+        # 记录日志，告诉用户线程已启动
+        log.debug("后台线程已启动")
 
     def _init_voice(self):
         """
         初始化语音引擎
 
-        这个方法创建一个 Windows 语音对象，并设置语速和音量
+        这个方法创建一个 Windows 语音对象，设置语速和音量，并选择中文语音
+        只在播报线程里调用一次，之后一直复用返回的语音对象
 
         返回值:
             voice: 配置好的语音对象，可以用来播报文字
@@ -137,10 +206,7 @@ class TTSPlayer:
             是 Windows 自带的语音编程接口
             我们不需要安装额外软件，直接调用系统功能
         """
-        # 初始化 COM 组件运行环境
-        # 在 Windows 中，COM 组件需要在特定的线程环境中运行
-        # 每次在新线程中使用 COM 组件前，都需要调用这个
-        pythoncom.CoInitialize()
+        # 只在播报线程里调用，线程开始时已经初始化过 COM 环境，这里不再重复初始化
 
         # 创建语音对象
         # Dispatch 就像是一个"召唤"操作
@@ -157,6 +223,34 @@ class TTSPlayer:
         # 我们的 volume 是 0.0 到 1.0，所以乘以 100
         voice.Volume = int(self.volume * 100)
 
+        # 查找中文语音
+        # GetVoices(必须满足的条件, 优先选择的条件) 在 SAPI 内部完成筛选和排序，
+        # 不用在 Python 里逐个读取每个语音的属性
+        tokens = voice.GetVoices(VOICE_REQUIRED_ATTRS, VOICE_OPTIONAL_ATTRS)
+        if tokens.Count:
+            self._voice_token = tokens.Item(0)
+        else:
+            # 没有简体中文语音时，退回按名称查找（比如繁体中文语音）
+            for v in voice.GetVoices():
+                # 获取当前语音的名称
+                name = v.GetAttribute("Name")
+
+                # 检查是否是中文语音
+                # Huihui 是微软的中文女声
+                # Xiaoxiao 是微软的中文语音（较新版本）
+                # Chinese 表示包含中文
+                if "Huihui" in name or "Xiaoxiao" in name or "Chinese" in name:
+                    self._voice_token = v
+                    # 找到一个合适的就停止搜索
+                    break
+
+        if self._voice_token is not None:
+            # 选择这个语音
+            voice.Voice = self._voice_token
+
+            # 记录日志
+            log.debug("选择语音: %s", self._voice_token.GetAttribute("Name"))
+
         # 返回配置好的语音对象
         return voice
 
@@ -165,99 +259,66 @@ class TTSPlayer:
         播报线程 - 持续运行，播报队列中的所有内容
 
         这个方法在线程中运行，流程是：
-        1. 检查队列是否有待播报的内容
-        2. 如果有，取出第一条，播放语音
-        3. 如果没有，等待一小会儿后继续检查
-        4. 重复直到 _running 变为 False
+        1. 从队列取出第一条待播报的内容（队列为空时休眠等待）
+        2. 播放语音
+        3. 重复直到 _running 变为 False，或者取到 stop() 放入的 None
 
         这是一个无限循环，只要 _running 为 True 就会一直运行
         """
-        # 打印日志，告诉用户播报线程开始工作了
-        print("[TTS] 播报线程已启动")
+        # 记录日志，告诉用户播报线程开始工作了
+        log.debug("播报线程已启动")
 
         # 初始化 COM 环境（在新线程中必须这样做）
-        pythoncom.CoInitialize()
+        # 整个线程只初始化这一次，之后创建、使用语音对象都不再重复调用
+        _ensure_com_initialized()
 
         # 只要运行标志为 True，就继续循环
         while self._running:
 
             # 从队列中取出待播报的内容
             # ======================
+            # 队列为空时线程在这里休眠，有新内容放进来会立即被唤醒
+            # 设置超时是为了定期检查 _running，保证线程能够退出
+            try:
+                text = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
 
-            # 加锁：防止其他线程同时操作队列
-            # with 语句会自动加锁和解锁
-            with self._lock:
-
-                # 检查队列是否为空
-                if self._queue:
-                    # 队列不为空，取出第一条消息
-                    # pop(0) 取出列表第一个元素，并从列表中删除
-                    text = self._queue.pop(0)
+            # None 是 stop() 放入的退出信号
+            if text is None:
+                break
 
-                    # 打印日志：显示取出的内容（只显示前20个字符）
-                    print(f"[TTS] 取出待播报内容: {text[:20]}...")
-                else:
-                    # 队列为空，没有要播报的内容
-                    text = None
+            # 记录日志：显示取出的内容（只显示前20个字符）
+            log.debug("取出待播报内容: %s...", text[:20])
 
+            # 播放语音
             # ======================
-            # 解锁自动发生，队列操作完成
-
-            # 检查是否有内容需要播报
-            if text:
-                # 有内容，播放语音
-                # ======================
-                try:
-                    # 创建语音对象
-                    voice = self._init_voice()
-
-                    # 遍历系统中所有可用的语音
-                    # GetVoices() 返回所有已安装的语音列表
-                    for v in voice.GetVoices():
-                        # 获取当前语音的名称
-                        name = v.GetAttribute("Name")
-
-                        # 打印日志：显示发现的语音名称
-                        print(f"[TTS] 发现语音: {name}")
-
-                        # 检查是否是中文语音
-                        # Huihui 是微软的中文女声
-                        # Xiaoxiao 是微软的中文语音（较新版本）
-                        # Chinese 表示包含中文
-                        if "Huihui" in name or "Xiaoxiao" in name or "Chinese" in name:
-                            # 选择这个语音
-                            voice.Voice = v
-
-                            # 打印日志
-                            print(f"[TTS] 选择语音: {name}")
-                            # 找到一个合适的就停止搜索
-                            break
-
-                    # 开始播报
-                    # Speak() 是同步方法，会阻塞直到播报完成
-                    voice.Speak(text)
-
-                    # 打印日志：播报完成
-                    print(f"[TTS] 播报完成")
-
-                except Exception as e:
-                    # 如果播放过程中出错，打印错误信息
-                    # 这样我们能看到具体是什么问题
-                    print(f"[TTS 错误] {e}")
-
-            else:
-                # 队列为空，没有内容要播报
-                # 等待 0.1 秒后继续检查队列
-                # 这样做可以避免 CPU 被这个线程占满
-
-                # 导入 time 模块（这里导入是为了避免全局依赖）
-                import time
-
-                # 休眠 0.1 秒
-                time.sleep(0.1)
+            try:
+                # 第一次播报时创建语音对象，之后一直复用
+                # 不必每句话都重新创建 COM 对象、重新查找中文语音
+                if self._voice is None:
+                    self._voice = self._init_voice()
+
+                # 开始播报
+                # 异步播报，然后分段等待播报结束
+                # 每等 SPEAK_POLL_MS 毫秒检查一次，调用了 stop() 就立即中断当前语音
+                # 语音对象只在这个线程里使用，不需要跨线程调用 COM 对象
+                self._voice.Speak(text, SVSF_ASYNC)
+                while not self._voice.WaitUntilDone(SPEAK_POLL_MS):
+                    if not self._running:
+                        self._voice.Speak("", SVSF_ASYNC | SVSF_PURGE_BEFORE_SPEAK)
+                        break
+
+                # 记录日志：播报完成
+                log.debug("播报完成")
+
+            except Exception as e:
+                # 如果播放过程中出错，记录错误信息（错误级别的日志默认会显示）
+                # 这样我们能看到具体是什么问题
+                log.error("播报失败: %s", e)
 
         # 循环结束（_running 变为 False）
-        print("[TTS] 播报线程已退出")
+        log.debug("播报线程已退出")
 
     def speak(self, text: str) -> None:
         """
@@ -272,9 +333,9 @@ class TTSPlayer:
         工作流程:
             1. 检查文字是否为空
             2. 去除首尾空白字符
-            3. 加锁
-            4. 把文字加入队列
-            5. 解锁
+            3. 和上一次加入队列的文字相同时跳过，不重复播报
+            4. 把文字加入队列（会立即唤醒正在等待的播报线程）
+               队列满了就丢掉最旧的一条
         """
         # 检查文字是否为空
         if not text:
@@ -287,16 +348,16 @@ class TTSPlayer:
         if not text:
             return
 
-        # 加锁，保护队列
-        with self._lock:
-
-            # 把文字加入到队列末尾
-            self._queue.append(text)
+        # 和上一次加入队列的文字相同，不重复播报
+        if text == self._last_text:
+            return
+        self._last_text = text
 
-            # 打印日志：显示当前队列中有多少条消息
-            print(f"[TTS] 添加到队列，当前队列长度: {len(self._queue)}")
+        # 把文字加入到队列末尾
+        put_latest(self._queue, text)
 
-        # 解锁自动发生
+        # 记录日志：显示当前队列中有多少条消息
+        log.debug("添加到队列，当前队列长度: %d", self._queue.qsize())
 
     def stop(self) -> None:
         """
@@ -308,30 +369,22 @@ class TTSPlayer:
         工作流程:
             1. 设置运行标志为 False（让播报线程退出循环）
             2. 清空队列（不播报排队中的消息）
-            3. 尝试强制停止当前正在播放的语音
+            3. 放入退出信号 None，立即唤醒正在等待的播报线程
+            4. 播报线程发现运行标志变为 False 后，会立即中断正在播放的语音
         """
         # 设置运行标志为 False
         # 这会让播报线程的 while 循环结束
         self._running = False
 
-        # 加锁，清空队列
-        with self._lock:
-            self._queue.clear()
+        # 清空队列
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
 
-        # 尝试强制停止当前语音
-        try:
-            # 初始化 COM
-            pythoncom.CoInitialize()
-
-            # 创建语音对象
-            voice = win32com.client.Dispatch("SAPI.SpVoice")
-
-            # 播放空内容，并设置停止标志
-            # 3 = SVSFPurgeBeforeSpeak 表示停止当前播报
-            voice.Speak("", 3)
-        except:
-            # 如果出错就忽略（因为程序可能正在退出）
-            pass
+        # 放入退出信号，播报线程取到后立即退出循环
+        put_latest(self._queue, None)
 
     def get_available_voices(self) -> list:
         """
@@ -344,14 +397,21 @@ class TTSPlayer:
             - gender: 语音性别
             - language: 支持的语言
 
+        第一次调用时查询系统并缓存结果，之后直接返回缓存
+        （运行过程中新安装的语音不会出现在列表里）
+
         使用示例:
             voices = tts.get_available_voices()
             for v in voices:
                 print(v['name'])
         """
+        # 已经获取过，直接返回缓存（复制一份，调用方修改列表不会影响缓存）
+        if self._voices_cache is not None:
+            return list(self._voices_cache)
+
         try:
-            # 初始化 COM
-            pythoncom.CoInitialize()
+            # 初始化 COM（当前线程已经初始化过就跳过）
+            _ensure_com_initialized()
 
             # 创建语音对象
             voice = win32com.client.Dispatch("SAPI.SpVoice")
@@ -369,10 +429,11 @@ class TTSPlayer:
                     "language": v.GetAttribute("Language"), # 语言
                 })
 
-            # 返回语音列表
-            return voices
+            # 缓存并返回语音列表
+            self._voices_cache = voices
+            return list(voices)
 
         except Exception as e:
-            # 获取失败时打印错误，返回空列表
-            print(f"[错误] 获取语音列表失败: {e}")
+            # 获取失败时记录错误，返回空列表
+            log.error("获取语音列表失败: %s", e)
             return []
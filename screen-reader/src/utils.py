@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+=================================================================
+通用工具模块 (Utilities Module)
+=================================================================
+
+功能说明:
+    存放多个模块共用的小工具函数
+
+核心函数:
+    put_latest - 把元素放进队列，队列满了就丢掉最旧的一个
+
+依赖说明:
+    - queue: 线程安全的队列
+=================================================================
+"""
+
+# queue: 线程安全的队列
+import queue
+
+
+def put_latest(q: queue.Queue, item) -> None:
+    """
+    把元素放进队列，队列满了就丢掉最旧的一个
+
+    屏幕阅读只关心最新的内容:
+        - 监控流水线里，旧的截图/识别结果可以丢弃
+        - 播报跟不上时，旧的待播报内容可以丢弃
+
+    参数说明:
+        q: 设置了 maxsize 的队列
+        item: 要放进队列的元素
+    """
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                # 刚好被别的线程取空了，再试一次放入
+                pass